@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Output backends for Android launcher icons: PNG, lossless or lossy WebP, and vector adaptive icons
+The vector backend describes the whistle scene as VectorDrawable (and SVG) paths instead of pixels
+
+Raster backends encode the same rendered images in another container; the
+vector backend writes one density-independent adaptive icon
+(mipmap-anydpi-v26) that API 26+ launchers use instead of the mipmaps.
+"""
+
+import argparse
+import io
+import os
+
+from PIL import ImageColor
+
+from atomic_writer import OutputWriter
+from icon_assets import load_master
+from png_encoding import ENCODING_PROFILES, encode_png
+from whistle_scene import SCENE_UNITS, WHISTLE_SCENE
+
+# libwebp effort per encoding profile; for lossless output 'quality' is effort too
+WEBP_EFFORT = {
+    'dev': {'method': 0, 'quality': 50},
+    'default': {'method': 4, 'quality': 80},
+    'release': {'method': 6, 'quality': 100},
+}
+
+# Quality of the lossy WebP color planes; alpha is always kept lossless
+WEBP_LOSSY_QUALITY = 90
+
+# Adaptive icon layers are 108dp; the outer 18dp on each side may be masked
+# or used for parallax, so the 1024-unit scene fills the central 72dp
+ADAPTIVE_LAYER_DP = 108
+ADAPTIVE_ARTWORK_DP = 72
+ADAPTIVE_VIEWPORT = SCENE_UNITS * ADAPTIVE_LAYER_DP // ADAPTIVE_ARTWORK_DP
+ADAPTIVE_INSET = (ADAPTIVE_VIEWPORT - SCENE_UNITS) // 2
+
+ADAPTIVE_ICON_XML = """<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@drawable/ic_launcher_background" />
+    <foreground android:drawable="@drawable/ic_launcher_foreground" />
+</adaptive-icon>
+"""
+
+def encode_webp(image, profile='default'):
+    """Lossless WebP: the same pixels as the PNG, usually in fewer bytes"""
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', lossless=True, **WEBP_EFFORT[profile])
+    return buffer.getvalue()
+
+def encode_webp_lossy(image, profile='default'):
+    """Lossy WebP at WEBP_LOSSY_QUALITY with lossless alpha, so round masks keep clean edges"""
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=WEBP_LOSSY_QUALITY, alpha_quality=100,
+               method=WEBP_EFFORT[profile]['method'])
+    return buffer.getvalue()
+
+# Raster backends as (file extension, encoder(image, profile) -> bytes)
+ANDROID_FORMATS = {
+    'png': ('.png', encode_png),
+    'webp': ('.webp', encode_webp),
+    'webp-lossy': ('.webp', encode_webp_lossy),
+}
+
+def android_filename(filename, android_format='png'):
+    """ic_launcher.png -> ic_launcher.webp for the WebP backends"""
+    return os.path.splitext(filename)[0] + ANDROID_FORMATS[android_format][0]
+
+def encode_android_icon(image, android_format='png', profile='default'):
+    return ANDROID_FORMATS[android_format][1](image, profile)
+
+def remove_other_formats(folder, filename):
+    """Delete copies of a launcher icon in other formats; aapt2 rejects two files for one resource"""
+    stem, extension = os.path.splitext(filename)
+    for other in {ext for ext, _ in ANDROID_FORMATS.values()} - {extension}:
+        path = os.path.join(folder, stem + other)
+        if os.path.exists(path):
+            os.remove(path)
+
+def _number(value):
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+def _color(color, alpha_first=False):
+    red, green, blue = ImageColor.getrgb(color)[:3] if isinstance(color, str) else color
+    return f"#{'FF' if alpha_first else ''}{red:02X}{green:02X}{blue:02X}"
+
+def scene_paths(scene, skip=()):
+    """Yield (path data, fill, stroke, stroke width) for each scene shape, in scene units
+
+    Strokes are centred on the path, so outlines are inset by half their
+    width to cover the same pixels the raster renderer fills inside the box.
+    Level-of-detail limits do not apply: a vector icon has every detail.
+    """
+    n = _number
+    for kind, geometry, color, width, _ in scene['shapes']:
+        if kind in skip:
+            continue
+        if kind == 'rounded_rectangle':
+            left, top, right, bottom, r = geometry
+            yield (f"M{n(left + r)},{n(top)}H{n(right - r)}A{n(r)},{n(r)} 0 0 1 {n(right)},{n(top + r)}"
+                   f"V{n(bottom - r)}A{n(r)},{n(r)} 0 0 1 {n(right - r)},{n(bottom)}"
+                   f"H{n(left + r)}A{n(r)},{n(r)} 0 0 1 {n(left)},{n(bottom - r)}"
+                   f"V{n(top + r)}A{n(r)},{n(r)} 0 0 1 {n(left + r)},{n(top)}Z", color, None, 0)
+        elif kind == 'line':
+            x0, y0, x1, y1 = geometry
+            yield f"M{n(x0)},{n(y0)}L{n(x1)},{n(y1)}", None, color, width
+        elif kind in ('ellipse', 'border'):
+            if kind == 'border':
+                inset, = geometry
+                geometry = (inset, inset, SCENE_UNITS - inset, SCENE_UNITS - inset)
+            left, top, right, bottom = geometry
+            rx = (right - left - width) / 2
+            ry = (bottom - top - width) / 2
+            cx, cy = (left + right) / 2, (top + bottom) / 2
+            data = (f"M{n(cx - rx)},{n(cy)}A{n(rx)},{n(ry)} 0 1 0 {n(cx + rx)},{n(cy)}"
+                    f"A{n(rx)},{n(ry)} 0 1 0 {n(cx - rx)},{n(cy)}Z")
+            yield (data, None, color, width) if width else (data, color, None, 0)
+        else:
+            raise ValueError(f"Unknown scene shape: {kind}")
+
+def vector_foreground(scene=WHISTLE_SCENE):
+    """Adaptive-icon foreground VectorDrawable of the scene's shapes (the launcher masks the edge)"""
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<vector xmlns:android="http://schemas.android.com/apk/res/android"',
+        f'    android:width="{ADAPTIVE_LAYER_DP}dp"',
+        f'    android:height="{ADAPTIVE_LAYER_DP}dp"',
+        f'    android:viewportWidth="{ADAPTIVE_VIEWPORT}"',
+        f'    android:viewportHeight="{ADAPTIVE_VIEWPORT}">',
+        f'    <group android:translateX="{ADAPTIVE_INSET}" android:translateY="{ADAPTIVE_INSET}">',
+    ]
+    # The launcher's own mask shape replaces the circular border
+    for data, fill, stroke, width in scene_paths(scene, skip=('border',)):
+        paint = (f'android:fillColor="{_color(fill, True)}"' if fill else
+                 f'android:strokeColor="{_color(stroke, True)}" android:strokeWidth="{_number(width)}"')
+        lines.append(f'        <path {paint}')
+        lines.append(f'            android:pathData="{data}" />')
+    lines += ['    </group>', '</vector>', '']
+    return '\n'.join(lines)
+
+def vector_background(scene=WHISTLE_SCENE):
+    """Adaptive-icon background VectorDrawable: the scene's vertical gradient"""
+    start, end = scene['background']
+    size = ADAPTIVE_VIEWPORT
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<vector xmlns:android="http://schemas.android.com/apk/res/android"
+    xmlns:aapt="http://schemas.android.com/aapt"
+    android:width="{ADAPTIVE_LAYER_DP}dp"
+    android:height="{ADAPTIVE_LAYER_DP}dp"
+    android:viewportWidth="{size}"
+    android:viewportHeight="{size}">
+    <path android:pathData="M0,0H{size}V{size}H0Z">
+        <aapt:attr name="android:fillColor">
+            <gradient android:type="linear"
+                android:startX="0" android:startY="0"
+                android:endX="0" android:endY="{size}"
+                android:startColor="{_color(start, True)}"
+                android:endColor="{_color(end, True)}" />
+        </aapt:attr>
+    </path>
+</vector>
+"""
+
+def scene_svg(scene=WHISTLE_SCENE):
+    """The whole scene, gradient and border included, as a standalone SVG"""
+    start, end = scene['background']
+    lines = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SCENE_UNITS} {SCENE_UNITS}">',
+        '<defs><linearGradient id="bg" x1="0" y1="0" x2="0" y2="1">'
+        f'<stop offset="0" stop-color="{_color(start)}"/><stop offset="1" stop-color="{_color(end)}"/>'
+        '</linearGradient></defs>',
+        f'<rect width="{SCENE_UNITS}" height="{SCENE_UNITS}" fill="url(#bg)"/>',
+    ]
+    for data, fill, stroke, width in scene_paths(scene):
+        paint = (f'fill="{_color(fill)}"' if fill else
+                 f'fill="none" stroke="{_color(stroke)}" stroke-width="{width}"')
+        lines.append(f'<path {paint} d="{data}"/>')
+    lines += ['</svg>', '']
+    return '\n'.join(lines)
+
+def adaptive_icon_files(scene=WHISTLE_SCENE):
+    """Files of the vector adaptive icon, as {path relative to a res dir: bytes}"""
+    adaptive = ADAPTIVE_ICON_XML.encode()
+    return {
+        'drawable/ic_launcher_background.xml': vector_background(scene).encode(),
+        'drawable/ic_launcher_foreground.xml': vector_foreground(scene).encode(),
+        'mipmap-anydpi-v26/ic_launcher.xml': adaptive,
+        'mipmap-anydpi-v26/ic_launcher_round.xml': adaptive,
+    }
+
+def write_adaptive_icon(res_dir, scene=WHISTLE_SCENE, writer=None):
+    """Write the vector adaptive icon into res_dir; returns the files that changed
+
+    The writes go through writer (an OutputWriter) when given, and are on
+    disk once it is flushed; otherwise they are done before returning.
+    """
+    if writer is None:
+        with OutputWriter() as writer:
+            return write_adaptive_icon(res_dir, scene, writer)
+    changed = []
+    for name, data in adaptive_icon_files(scene).items():
+        path = os.path.join(res_dir, name)
+        try:
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    continue
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        writer.write(path, data, output=name)
+        changed.append(name)
+    return changed
+
+def report_formats(profile='default'):
+    """Print the bytes one res tree's launcher icons take in every backend"""
+    from generate_android_icons import ANDROID_SIZES, render_android_icons
+
+    logo = load_master()
+    icons = [image for _, size in ANDROID_SIZES for image in render_android_icons(logo, size).values()]
+    print(f"🎯 Launcher icon bytes per res tree ({len(icons)} rasters, '{profile}' profile):")
+    baseline = None
+    for android_format in ANDROID_FORMATS:
+        total = sum(len(encode_android_icon(image, android_format, profile)) for image in icons)
+        baseline = baseline or total
+        print(f"   {android_format:<11} {total:>9,} bytes  {100 * total / baseline:5.1f}%")
+    vector = sum(len(data) for data in adaptive_icon_files().values())
+    print(f"   {'vector':<11} {vector:>9,} bytes  (adaptive icon, API 26+; rasters still needed below)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', choices=sorted(ENCODING_PROFILES), default='default',
+                        help="encoding effort for every backend")
+    parser.add_argument('--svg', metavar='PATH', help="also write the whistle scene as an SVG file")
+    args = parser.parse_args()
+
+    report_formats(args.profile)
+    if args.svg:
+        with open(args.svg, 'w') as f:
+            f.write(scene_svg())
+        print(f"✅ Wrote {args.svg}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Content-addressed build manifests for generated assets
+Each output folder records the cache key it was rendered from and the hash it produced
+"""
+
+import hashlib
+import json
+import os
+
+from atomic_writer import write_atomic
+
+# Hidden so Xcode asset catalogs and aapt2 (which ignores ".*") skip it
+MANIFEST_NAME = ".icon-manifest.json"
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path):
+    """Hash a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(*parts):
+    """Combine input hashes and render parameters into a single key"""
+    return sha256_bytes(json.dumps(parts, sort_keys=True, default=str).encode())
+
+
+def load_manifest(folder):
+    """Return the manifest recorded in folder, or an empty one"""
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.setdefault('outputs', {})
+    return manifest
+
+
+def save_manifest(folder, manifest, writer=None):
+    """Write the manifest atomically, queued on writer (an OutputWriter) if one is given
+
+    It may land before the outputs it records: is_fresh re-hashes each file,
+    so an output that never reached the disk is simply rebuilt.
+    """
+    os.makedirs(folder, exist_ok=True)
+    data = (json.dumps(manifest, indent=2, sort_keys=True) + '\n').encode()
+    path = os.path.join(folder, MANIFEST_NAME)
+    if writer is None:
+        write_atomic(path, data)
+    else:
+        writer.write(path, data, output=MANIFEST_NAME)
+
+
+def is_fresh(manifest, folder, name, key):
+    """True if name was built from key and the file on disk still matches its recorded hash"""
+    entry = manifest['outputs'].get(name)
+    if not entry or entry.get('key') != key:
+        return False
+    path = os.path.join(folder, name)
+    if not os.path.exists(path) or os.path.getsize(path) != entry.get('size'):
+        return False
+    return sha256_file(path) == entry.get('sha256')
+
+
+def record_output(manifest, name, key, data, inputs):
+    """Record that name was written with data, built from key and the given input hashes"""
+    manifest['outputs'][name] = {
+        'key': key,
+        'inputs': inputs,
+        'sha256': sha256_bytes(data),
+        'size': len(data),
+    }
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Optional per-stage timing trace for the asset pipeline
+Writes Chrome trace JSON (chrome://tracing, Perfetto) with a per-output summary
+
+Tracing is off unless enable() is called or ASSET_TRACE=<path> is set; while
+off, stage() hands back one shared no-op context so instrumented code pays
+only a function call.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+_events = None
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def annotate(self, **args):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+_local = threading.local()
+
+
+class _Stage:
+    def __init__(self, name, output, args):
+        self.name = name
+        self.output = output
+        self.args = args
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault('stack', [])
+        parent = stack[-1].output if stack else None
+        if parent and self.output:
+            self.output = f"{parent}/{self.output}"
+        elif parent:
+            self.output = parent
+        stack.append(self)
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        finished = time.perf_counter_ns()
+        _local.stack.pop()
+        args = dict(self.args)
+        if self.output:
+            args['output'] = self.output
+        _events.append({
+            'name': self.name,
+            'ph': 'X',
+            'ts': self.started / 1000,
+            'dur': (finished - self.started) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+        return False
+
+    def annotate(self, **args):
+        """Attach extra values (e.g. bytes=len(data)) to this stage's event"""
+        self.args.update(args)
+
+
+def enabled():
+    return _events is not None
+
+
+def enable():
+    global _events
+    if _events is None:
+        _events = []
+
+
+def stage(name, output=None, **args):
+    """Time a pipeline stage; output names the file it contributes to
+
+    Nested stages inherit (and extend) the output of the enclosing stage.
+    """
+    if _events is None:
+        return _NULL_STAGE
+    return _Stage(name, output, args)
+
+
+def collect(function, *args):
+    """Run function with tracing on and return (result, events) for the parent process"""
+    global _events
+    enable()
+    start = len(_events)
+    result = function(*args)
+    events = _events[start:]
+    del _events[start:]
+    return result, events
+
+
+def merge(events):
+    """Add events recorded in a worker process"""
+    if _events is not None:
+        _events.extend(events)
+
+
+def summarize(events):
+    """Total duration per stage and output bytes, keyed by output file"""
+    outputs = {}
+    for event in events:
+        output = event['args'].get('output')
+        if not output:
+            continue
+        entry = outputs.setdefault(output, {'stages': {}})
+        stage_total = entry['stages'].setdefault(event['name'], {'ms': 0.0, 'count': 0})
+        stage_total['ms'] += event['dur'] / 1000
+        stage_total['count'] += 1
+        if 'bytes' in event['args']:
+            entry['bytes'] = event['args']['bytes']
+    return outputs
+
+
+def write(path):
+    """Write the recorded events as Chrome trace JSON"""
+    if _events is None:
+        return
+    trace = {
+        'traceEvents': _events,
+        'displayTimeUnit': 'ms',
+        'otherData': {'outputs': summarize(_events)},
+    }
+    with open(path, 'w') as f:
+        json.dump(trace, f, indent=1)
+    print(f"✅ Trace with {len(_events)} events written to: {path}")
+
+
+if os.environ.get('ASSET_TRACE'):
+    enable()
+    # Worker processes inherit the variable; only the process that set up the
+    # trace writes the file, workers hand their events back through collect()
+    owner = os.environ.setdefault('ASSET_TRACE_OWNER', str(os.getpid()))
+    if owner == str(os.getpid()):
+        atexit.register(write, os.environ['ASSET_TRACE'])
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Atomic file output for the generators, written on background I/O threads
+Every file goes to a temp name in its folder and is renamed into place, so readers never see a torn file
+
+Rendering and encoding stay on the calling thread (or process pool); only the
+finished bytes are handed to the writer. Each file is fsynced before its
+rename, and each folder touched by a batch is fsynced once when the batch is
+flushed instead of once per file.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import threading
+
+import asset_trace
+
+# Threads writing files; disk I/O releases the GIL, so a few keep the disk busy
+IO_WORKERS = 4
+
+def fsync_dir(folder):
+    """Persist a folder's entries (renames); a no-op where folders cannot be opened, e.g. Windows"""
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_atomic(path, data, also=(), link=False, durable=True, sync_dir=True):
+    """Write data to path through a temp file and a rename, then give every path in also the same contents
+
+    Paths in also get their own copy, or a hardlink to path with link (a copy
+    where the filesystem refuses one); either replaces its target atomically
+    too. With durable, contents are fsynced before each rename, and sync_dir
+    fsyncs the folders afterwards (leave it off when the caller batches that).
+    """
+    path = os.fspath(path)
+    _replace_with_bytes(path, data, durable)
+    for target in map(os.fspath, also):
+        if not (link and _replace_with_link(path, target)):
+            _replace_with_bytes(target, data, durable)
+    if durable and sync_dir:
+        for folder in sorted({os.path.dirname(os.path.abspath(target)) for target in (path, *also)}):
+            fsync_dir(folder)
+
+def _temp_name(path):
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, f".{name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+def _replace_with_bytes(path, data, durable):
+    temp = _temp_name(path)
+    try:
+        with open(temp, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+def _replace_with_link(source, path):
+    """Hardlink path to source atomically; False if the filesystem cannot link them"""
+    temp = _temp_name(path)
+    try:
+        os.link(source, temp)
+    except OSError:
+        return False
+    try:
+        os.replace(temp, path)
+    except BaseException:
+        os.remove(temp)
+        raise
+    return True
+
+def save_image(image, path, format='PNG', **options):
+    """Encode an image in memory and write it atomically (a drop-in for image.save(path))"""
+    buffer = io.BytesIO()
+    image.save(buffer, format, **options)
+    write_atomic(path, buffer.getvalue())
+
+class OutputWriter:
+    """Queue atomic writes on a background thread pool
+
+    write() returns immediately so the caller can render the next output
+    while earlier ones reach the disk. flush() (also run on leaving a with
+    block) waits for every queued write, re-raises the first failure and
+    fsyncs each touched folder once.
+    """
+
+    def __init__(self, workers=IO_WORKERS, durable=True):
+        self.durable = durable
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='output-writer')
+        self._pending = []
+        self._folders = set()
+        self._lock = threading.Lock()
+
+    def write(self, path, data, also=(), link=False, output=None):
+        """Queue data for path and the paths in also (see write_atomic); returns at once
+
+        A path must not be queued twice before the next flush().
+        """
+        folders = {os.path.dirname(os.path.abspath(target)) for target in (path, *also)}
+        with self._lock:
+            self._folders.update(folders)
+            self._pending.append(self._pool.submit(self._write, path, data, list(also), link, output))
+
+    def _write(self, path, data, also, link, output):
+        with asset_trace.stage('write', output=output, bytes=len(data)):
+            write_atomic(path, data, also, link, self.durable, sync_dir=False)
+
+    def flush(self):
+        """Wait for queued writes, then fsync each folder they touched once"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            folders, self._folders = self._folders, set()
+        errors = [future.exception() for future in pending]
+        if self.durable:
+            with asset_trace.stage('fsync-dirs', folders=len(folders)):
+                for folder in sorted(folders):
+                    fsync_dir(folder)
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Benchmark the icon and bundle generators over a matrix of sizes and source images
+Reports cold and warm median wall time and Pillow allocations, and compares against a saved baseline
+
+Cold calls run with the render caches cleared, warm calls with them kept.
+Allocations are the images and memory blocks Pillow creates during one cold
+call, so they do not include the source setup. Timings are compared relative
+to a fixed calibration workload run next to them, so a machine that is slower
+overall does not read as a regression.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageFilter
+
+import icon_assets
+import icon_masks
+import text_layers
+import whistle_scene
+from icon_assets import MASTER_LOGO_PATH, PRIMARY_BLUE, SECONDARY_BLUE, load_master
+from fix_ios_icon_solid import render_solid_app_icon
+from generate_all_whistle_icons import create_whistle_icon
+from generate_android_icons import create_foreground_icon, create_round_icon
+from generate_android_15_aab import generate_android_15_aab
+
+BENCH_SIZES = [48, 192, 1024]
+
+# Relative slowdown (or growth) of the median that counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Timing differences below this are scheduler noise, not regressions
+TIMING_NOISE_MS = 2.0
+
+# Metrics compared against the baseline; timings get the TIMING_NOISE_MS floor
+COMPARED_METRICS = ('wall_cold_median_ms', 'wall_warm_median_ms', 'pillow_blocks')
+
+# Memoized rendering steps, cleared before each cold call so it rebuilds them
+RENDER_CACHES = (
+    icon_assets._gradient,
+    icon_masks._ellipse_mask,
+    text_layers._text_masks,
+    whistle_scene._compile_shapes,
+)
+
+def synthetic_rgb(size=2048):
+    """Large opaque master: brand gradient blended with deterministic fractal detail"""
+    gradient = Image.new('RGB', (1, 2), PRIMARY_BLUE)
+    gradient.putpixel((0, 1), SECONDARY_BLUE)
+    gradient = gradient.resize((size, size), Image.Resampling.BILINEAR)
+    detail = Image.effect_mandelbrot((size, size), (-2.0, -1.5, 1.0, 1.5), 64).convert('RGB')
+    return Image.blend(gradient, detail, 0.25)
+
+def synthetic_rgba(size=512):
+    """Transparent master with a soft circular alpha, like a cut-out logo"""
+    image = Image.radial_gradient('L').resize((size, size))
+    alpha = image.point(lambda value: 255 if value < 128 else 0)
+    return Image.merge('RGBA', [image, image.rotate(90), image.rotate(180), alpha])
+
+# Source images every generator is run against; all available offline
+BENCH_SOURCES = {
+    'master': lambda: load_master(MASTER_LOGO_PATH),
+    'synthetic-rgb-2048': synthetic_rgb,
+    'synthetic-rgba-512': synthetic_rgba,
+}
+
+def resized(source, size):
+    return source.resize((size, size), Image.Resampling.LANCZOS)
+
+def encoded_icon(source, size):
+    """The source as an encoded launcher icon of the given size"""
+    buffer = io.BytesIO()
+    resized(source, size).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def bench_aab(icon, size):
+    """Package a bundle into a scratch directory with the encoded icon as launcher icon"""
+    with tempfile.TemporaryDirectory() as scratch:
+        icon_path = os.path.join(scratch, "ic_launcher.png")
+        with open(icon_path, 'wb') as f:
+            f.write(icon)
+        generate_android_15_aab(output_dir=scratch, icon_path=icon_path)
+
+# Generator name -> callable(prepared input, size)
+BENCHMARKS = {
+    'create_whistle_icon': lambda source, size: create_whistle_icon(size),
+    'create_round_icon': create_round_icon,
+    'create_foreground_icon': create_foreground_icon,
+    'create_solid_app_icon': render_solid_app_icon,
+    'generate_android_15_aab': bench_aab,
+}
+
+# Generators that draw from scratch; they run once per size instead of once per source
+SOURCE_FREE = {'create_whistle_icon'}
+
+# Untimed setup turning (source image, size) into a generator's input; the
+# source is passed through as is for generators without an entry
+BENCH_SETUP = {
+    'create_round_icon': resized,
+    'generate_android_15_aab': encoded_icon,
+}
+
+def clear_render_caches():
+    for cached in RENDER_CACHES:
+        cached.cache_clear()
+
+def pillow_allocations(call):
+    """Run call and return (images created, memory blocks allocated) by Pillow meanwhile"""
+    before = Image.core.get_stats()
+    call()
+    after = Image.core.get_stats()
+    return after['new_count'] - before['new_count'], after['allocated_blocks'] - before['allocated_blocks']
+
+def calibration_workload(image=synthetic_rgba(256)):
+    """A fixed Pillow workload timed next to every call, to measure how fast the machine runs right now"""
+    image.resize((192, 192), Image.Resampling.LANCZOS).filter(ImageFilter.GaussianBlur(2))
+
+def time_calls(call, repeat, cold):
+    """(call timings, calibration timings) of repeat calls, clearing the render caches before each one if cold"""
+    timings = []
+    calibration = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        calibration_workload()
+        calibration.append(time.perf_counter() - started)
+        if cold:
+            clear_render_caches()
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return timings, calibration
+
+def run_case(name, source_name, size, repeat):
+    """Time one generator/source/size case (runs in a fresh worker process)
+
+    source_name is None for generators in SOURCE_FREE.
+    """
+    generator = BENCHMARKS[name]
+    source = BENCH_SOURCES[source_name]() if source_name else None
+    if name in BENCH_SETUP:
+        source = BENCH_SETUP[name](source, size)
+    sink = io.StringIO()
+
+    def call():
+        with contextlib.redirect_stdout(sink):
+            generator(source, size)
+
+    # Warm-up so imports and font loads are not billed to the first sample
+    call()
+
+    clear_render_caches()
+    images, blocks = pillow_allocations(call)
+    cold, cold_calibration = time_calls(call, repeat, cold=True)
+    warm, warm_calibration = time_calls(call, repeat, cold=False)
+
+    return {
+        'generator': name,
+        'source': source_name,
+        'size': size,
+        'repeat': repeat,
+        'wall_cold_median_ms': statistics.median(cold) * 1000,
+        'wall_warm_median_ms': statistics.median(warm) * 1000,
+        'calibration_median_ms': statistics.median(cold_calibration + warm_calibration) * 1000,
+        'pillow_images': images,
+        'pillow_blocks': blocks,
+    }
+
+def case_id(result):
+    return f"{result['generator']}[{result['source'] or '-'}@{result['size']}]"
+
+def run_benchmarks(generators, sources, sizes, repeat):
+    """Run the full matrix, each case isolated in its own process so no case inherits another's caches"""
+    results = []
+    for name in generators:
+        for source_name in ([None] if name in SOURCE_FREE else sources):
+            for size in sizes:
+                result = run_isolated(name, source_name, size, repeat)
+                results.append(result)
+                print(f"⏱️  {case_id(result):<50} {result['wall_cold_median_ms']:9.2f} ms cold "
+                      f"{result['wall_warm_median_ms']:9.2f} ms warm  "
+                      f"{result['pillow_images']:4d} images {result['pillow_blocks']:4d} blocks")
+    return results
+
+def run_isolated(name, source_name, size, repeat):
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_case, name, source_name, size, repeat).result()
+
+def save_baseline(path, results):
+    baseline = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+    print(f"✅ Baseline saved to: {path}")
+
+def expected_metrics(before, result):
+    """The baseline entry's metrics, with timings scaled to how fast the machine ran the calibration this time"""
+    expected = {metric: before[metric] for metric in COMPARED_METRICS if metric in before}
+    if before.get('calibration_median_ms') and result.get('calibration_median_ms'):
+        speed = result['calibration_median_ms'] / before['calibration_median_ms']
+        for metric in expected:
+            if metric.endswith('_ms'):
+                expected[metric] *= speed
+    return expected
+
+def regressed_metrics(before, result, threshold):
+    """(metric, expected value) pairs where result exceeds the baseline entry by more than threshold"""
+    regressed = []
+    # Medians, not minimums: one lucky run in the baseline must not make every later run look slow
+    for metric, expected in expected_metrics(before, result).items():
+        if metric.endswith('_ms') and result[metric] - expected < TIMING_NOISE_MS:
+            continue
+        if expected and result[metric] > expected * (1 + threshold):
+            regressed.append((metric, expected))
+    return regressed
+
+def compare_with_baseline(path, results, threshold=DEFAULT_THRESHOLD):
+    """Print regressions against a saved baseline; True if none exceed the threshold
+
+    A case that looks slower is run once more and only reported if the
+    rerun regresses too, so a single stall of the machine is not a failure.
+    """
+    with open(path) as f:
+        baseline = {case_id(result): result for result in json.load(f)['results']}
+
+    regressions = 0
+    for result in results:
+        before = baseline.get(case_id(result))
+        if before is None:
+            print(f"➕ {case_id(result)}: not in baseline")
+            continue
+        if not regressed_metrics(before, result, threshold):
+            continue
+        result = run_isolated(result['generator'], result['source'], result['size'], result['repeat'])
+        for metric, expected in regressed_metrics(before, result, threshold):
+            change = result[metric] / expected - 1
+            print(f"❌ {case_id(result)}: {metric} {expected:.1f} -> {result[metric]:.1f} (+{change:.0%})")
+            regressions += 1
+
+    if regressions:
+        print(f"❌ {regressions} regressions above {threshold:.0%}")
+        return False
+    print(f"✅ No regressions above {threshold:.0%} against {path}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the icon and bundle generators")
+    parser.add_argument('--generator', action='append', choices=sorted(BENCHMARKS),
+                        help="generator to run (repeatable, default: all)")
+    parser.add_argument('--source', action='append', choices=sorted(BENCH_SOURCES),
+                        help="source image to run against (repeatable, default: all)")
+    parser.add_argument('--size', action='append', type=int,
+                        help=f"output size in px (repeatable, default: {BENCH_SIZES})")
+    parser.add_argument('--repeat', type=int, default=9, help="timed runs per case (default: 9)")
+    parser.add_argument('--save', metavar='JSON', help="write results as a new baseline")
+    parser.add_argument('--compare', metavar='JSON', help="compare results against a baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed relative regression (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.generator or list(BENCHMARKS), args.source or list(BENCH_SOURCES),
+                             args.size or BENCH_SIZES, args.repeat)
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare and not compare_with_baseline(args.compare, results, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
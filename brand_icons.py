@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Generate branded iOS and Android icon sets for many organisations in one batch
+Color-independent layers are rendered once per size and shared; each organisation only fills and composites
+
+The organisations file is JSON, either a list or {"organisations": [...]}:
+
+    {"slug": "riverside-fc", "label": "RIVERSIDE FC",
+     "colors": {"primary": "#7A1F2B", "secondary": "#D9443C", "foreground": "white"},
+     "logo": "logos/riverside.png"}
+
+Only slug and colors.primary/secondary are required. Without a logo the
+whistle scene is drawn in the foreground color; with one, the logo replaces
+it. The label is drawn below the artwork on the App Store icon, outlined in
+colors.outline (default: primary). Logo paths are relative to the file.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from PIL import Image, ImageColor
+
+from asset_cache import cache_key, is_fresh, load_manifest, record_output, save_manifest, sha256_file
+from atomic_writer import OutputWriter
+from generate_all_whistle_icons import IOS_ICON_FILES, contents_json
+from generate_android_icons import ANDROID_SIZES, create_round_icon
+from icon_assets import REPO_ROOT, decode_logo, vertical_gradient
+from png_encoding import ENCODING_PROFILES, encode_png
+from text_layers import BRAND_FONT_PATH, load_font, paint_text
+from whistle_scene import SCENE_UNITS, WHISTLE_SCENE, compile_scene, replay
+
+BRAND_OUTPUT_DIR = REPO_ROOT / "branded-icons"
+
+# Modules whose code shapes a branded set; editing one re-renders every organisation
+BRAND_MODULES = ['icon_assets', 'icon_masks', 'whistle_scene', 'text_layers', 'generate_all_whistle_icons',
+                 'generate_android_icons', 'png_encoding', __name__]
+
+# Label placement in scene units, as on the prominent whistle icon
+LABEL_FONT_SIZE = 60
+LABEL_TOP = 600
+LABEL_STROKE = 2
+# Smallest icon the label is drawn on (it is unreadable below this)
+LABEL_MIN_SIZE = 512
+
+# Logo boxes in scene units (left, top, right, bottom): the fix_ios_icon
+# padding, or above the label when there is one
+LOGO_BOX = (112, 112, 912, 912)
+LABELLED_LOGO_BOX = (302, 150, 722, 570)
+
+SLUG_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+def parse_organisation(entry, base_dir):
+    """Validate one organisation entry and return it with colors as RGB tuples"""
+    slug = entry.get('slug', '')
+    if not SLUG_PATTERN.match(slug):
+        raise ValueError(f"invalid slug {slug!r}: use lowercase letters, digits, '-' and '_'")
+    colors = entry.get('colors', {})
+    try:
+        primary = ImageColor.getrgb(colors['primary'])[:3]
+        secondary = ImageColor.getrgb(colors['secondary'])[:3]
+        foreground = ImageColor.getrgb(colors.get('foreground', 'white'))[:3]
+        outline = ImageColor.getrgb(colors['outline'])[:3] if 'outline' in colors else primary
+    except KeyError as e:
+        raise ValueError(f"{slug}: missing color {e}") from None
+    except ValueError as e:
+        raise ValueError(f"{slug}: {e}") from None
+
+    logo = entry.get('logo')
+    if logo:
+        logo = os.path.join(base_dir, logo)
+        if not os.path.exists(logo):
+            raise ValueError(f"{slug}: logo {logo} not found")
+    return {
+        'slug': slug,
+        'label': entry.get('label', ''),
+        'primary': primary,
+        'secondary': secondary,
+        'foreground': foreground,
+        'outline': outline,
+        'logo': logo,
+    }
+
+def load_organisations(path):
+    """Read and validate an organisations file; slugs must be unique"""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('organisations', [])
+    base_dir = os.path.dirname(os.path.abspath(path))
+    organisations = [parse_organisation(entry, base_dir) for entry in data]
+    slugs = [org['slug'] for org in organisations]
+    duplicates = sorted({slug for slug in slugs if slugs.count(slug) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate slugs: {', '.join(duplicates)}")
+    return organisations
+
+@lru_cache(maxsize=None)
+def whistle_layer(size):
+    """Coverage mask of every whistle scene shape at size, shared by all organisations"""
+    # The scene's shapes are all drawn in one color, so replaying them onto
+    # an 'L' image gives the mask that color is pasted through
+    return replay(Image.new('L', (size, size), 0), compile_scene(WHISTLE_SCENE, size))
+
+@lru_cache(maxsize=1)
+def tenant_logo(path):
+    """The decoded logo at path; organisations render one after another, so only the latest is kept"""
+    return decode_logo(path)
+
+@lru_cache(maxsize=256)
+def logo_layer(path, box, size):
+    """A logo resized into box (scene units) at size, and its top-left position"""
+    left, top, right, bottom = (value * size // SCENE_UNITS for value in box)
+    fit = min(right - left, bottom - top)
+    logo = tenant_logo(path).resize((fit, fit), Image.Resampling.LANCZOS)
+    return logo, (left + (right - left - fit) // 2, top + (bottom - top - fit) // 2)
+
+def paint_artwork(image, org, size, offset=(0, 0), labelled=False):
+    """Paste the organisation's whistle (or logo) for a size x size icon at offset"""
+    if org['logo']:
+        logo, (x, y) = logo_layer(org['logo'], LABELLED_LOGO_BOX if labelled else LOGO_BOX, size)
+        image.paste(logo, (offset[0] + x, offset[1] + y), logo)
+    else:
+        image.paste(org['foreground'], offset, whistle_layer(size))
+
+def render_branded_icon(org, size):
+    """Render one opaque icon: gradient fill, artwork and, on large sizes, the label"""
+    icon = vertical_gradient(org['primary'], org['secondary'], size).copy()
+    labelled = bool(org['label']) and size >= LABEL_MIN_SIZE
+    paint_artwork(icon, org, size, labelled=labelled)
+    if labelled:
+        font_size = LABEL_FONT_SIZE * size // SCENE_UNITS
+        left, _, right, _ = load_font(BRAND_FONT_PATH, font_size).getbbox(org['label'])
+        paint_text(icon, ((size - (right - left)) // 2, LABEL_TOP * size // SCENE_UNITS), org['label'],
+                   org['foreground'], outline=org['outline'], font_path=BRAND_FONT_PATH, size=font_size,
+                   stroke=max(1, LABEL_STROKE * size // SCENE_UNITS))
+    return icon
+
+def render_branded_foreground(org, size):
+    """Adaptive-icon foreground: the artwork alone, padded by a quarter on each side"""
+    padding = size // 4
+    foreground = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    paint_artwork(foreground, org, size - padding * 2, offset=(padding, padding))
+    return foreground
+
+def render_organisation(org, profile='default'):
+    """Encode an organisation's full icon set as {relative path: PNG bytes}"""
+    outputs = {}
+    for size, filenames in IOS_ICON_FILES.items():
+        data = encode_png(render_branded_icon(org, size), profile)
+        for filename in filenames:
+            outputs[f"ios/AppIcon.appiconset/{filename}"] = data
+    for folder, size in ANDROID_SIZES:
+        icon = render_branded_icon(org, size)
+        outputs[f"android/{folder}/ic_launcher.png"] = encode_png(icon, profile)
+        outputs[f"android/{folder}/ic_launcher_round.png"] = encode_png(create_round_icon(icon, size), profile)
+        outputs[f"android/{folder}/ic_launcher_foreground.png"] = encode_png(
+            render_branded_foreground(org, size), profile)
+    return outputs
+
+@lru_cache(maxsize=None)
+def brand_digest():
+    """Hash the generator sources so a code change invalidates every branded set"""
+    return cache_key([sha256_file(sys.modules[name].__file__) for name in BRAND_MODULES])
+
+def organisation_key(org, profile):
+    logo_hash = sha256_file(org['logo']) if org['logo'] else None
+    return cache_key(brand_digest(), {**org, 'logo': logo_hash}, profile)
+
+def build_organisation(org, out_dir, profile='default', force=False, writer=None):
+    """Render and write one organisation's set unless it is up to date; returns bytes written
+
+    With writer (an OutputWriter) the files are only queued, and are on disk
+    once it is flushed.
+    """
+    if writer is None:
+        with OutputWriter() as writer:
+            return build_organisation(org, out_dir, profile, force, writer)
+    folder = os.path.join(out_dir, org['slug'])
+    manifest = load_manifest(folder)
+    key = organisation_key(org, profile)
+    if (not force and manifest['outputs']
+            and all(is_fresh(manifest, folder, name, key) for name in manifest['outputs'])):
+        return 0
+
+    outputs = render_organisation(org, profile)
+    outputs['ios/AppIcon.appiconset/Contents.json'] = contents_json().encode()
+    manifest = {'outputs': {}}
+    for name, data in outputs.items():
+        path = os.path.join(folder, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        writer.write(path, data, output=f"{org['slug']}/{name}")
+        record_output(manifest, name, key, data, {'organisation': org['slug']})
+    save_manifest(folder, manifest, writer)
+    return sum(len(data) for data in outputs.values())
+
+def build_chunk(organisations, out_dir, profile, force):
+    """Build a run of organisations in one process so they share its layer caches
+
+    One writer serves the whole run: an organisation's files reach the disk
+    while the next one renders, and each folder is fsynced once at the end.
+    """
+    with OutputWriter() as writer:
+        return [build_organisation(org, out_dir, profile, force, writer) for org in organisations]
+
+def generate_branded_sets(organisations, out_dir=BRAND_OUTPUT_DIR, workers=1, profile='default', force=False):
+    """Build every organisation's icon set, skipping those whose inputs are unchanged"""
+    started = time.perf_counter()
+    if workers > 1 and len(organisations) > 1:
+        # Contiguous chunks, a few per worker, keep each process's caches warm
+        step = max(1, -(-len(organisations) // (workers * 4)))
+        chunks = [organisations[i:i + step] for i in range(0, len(organisations), step)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(build_chunk, chunk, out_dir, profile, force) for chunk in chunks]
+            written = [size for future in futures for size in future.result()]
+    else:
+        written = build_chunk(organisations, out_dir, profile, force)
+
+    built = sum(1 for size in written if size)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {built} organisations built ({sum(written):,} bytes, '{profile}' profile), "
+          f"{len(organisations) - built} up to date in {elapsed:.2f} s")
+    if built:
+        print(f"🎯 {elapsed / len(organisations) * 1000:.1f} ms per organisation")
+    return built
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('organisations', help="JSON file listing the organisations")
+    parser.add_argument('-o', '--output', default=BRAND_OUTPUT_DIR,
+                        help="folder each organisation's set is written under")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="render/encode processes, 1 for serial (default: all cores)")
+    parser.add_argument('--profile', choices=sorted(ENCODING_PROFILES), default='default',
+                        help="PNG encoding profile: 'dev' is fastest, 'release' is smallest")
+    parser.add_argument('--force', action='store_true', help="rebuild every organisation")
+    args = parser.parse_args()
+
+    try:
+        organisations = load_organisations(args.organisations)
+    except (OSError, ValueError) as e:
+        print(f"❌ {args.organisations}: {e}")
+        sys.exit(1)
+    generate_branded_sets(organisations, args.output, max(1, args.workers), args.profile, args.force)
+
+if __name__ == "__main__":
+    main()
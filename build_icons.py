@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Build every iOS appiconset and Android mipmap icon in a single run
+The master logo is decoded once and shared by all targets
+"""
+
+from functools import lru_cache
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import asset_trace
+from asset_cache import cache_key, is_fresh, load_manifest, record_output, save_manifest, sha256_file
+from png_encoding import ENCODING_PROFILES
+from atomic_writer import OutputWriter
+from android_formats import (ANDROID_FORMATS, adaptive_icon_files, android_filename, encode_android_icon,
+                             remove_other_formats, scene_svg, write_adaptive_icon)
+from icon_assets import (ANDROID_RES_DIRS, IOS_ICONSET_DIR, MASTER_LOGO_PATH, decodes_reduced, load_master,
+                         memory_budget, set_memory_budget)
+from icon_masks import use_disk_cache
+from fix_ios_icon import render_app_icon
+from fix_ios_icon_solid import render_solid_app_icon
+from fix_whistle_icon import render_whistle_app_icon
+from generate_all_whistle_icons import (IOS_ICON_SIZES, contents_json, create_whistle_icon,
+                                        pyramid_whistle_icon, write_contents_json)
+from generate_android_icons import ANDROID_ICON_NAMES, ANDROID_SIZES, render_android_icons
+from whistle_scene import WHISTLE_SCENE
+from web_icons import WEB_ICON_DIR, head_links, web_files, web_filenames, web_sizes
+
+# Bump to invalidate every cached output without touching the generator sources
+GENERATOR_VERSION = 1
+
+# Platforms a build can target; iOS and Android are built unless told otherwise
+BUILD_TARGETS = ('ios', 'android', 'web')
+
+# Generator modules in import order (a module only imports ones listed before it);
+# tiled_decode and text_layers are imported on first use, so they may not be loaded yet
+GENERATOR_MODULES = [
+    'atomic_writer',
+    'tiled_decode',
+    'icon_assets',
+    'icon_masks',
+    'text_layers',
+    'whistle_scene',
+    'fix_ios_icon',
+    'fix_ios_icon_solid',
+    'fix_whistle_icon',
+    'generate_all_whistle_icons',
+    'png_encoding',
+    'android_formats',
+    'generate_android_icons',
+    'web_icons',
+    __name__,
+]
+
+# Modules every target renders or encodes with
+SHARED_MODULES = ['icon_assets', 'icon_masks', 'png_encoding', __name__]
+
+# Further modules each target renders with; together with SHARED_MODULES these
+# make up its cache key, so editing one target's code leaves the others fresh
+TARGET_MODULES = {
+    'whistle': ['whistle_scene', 'generate_all_whistle_icons'],
+    'whistle-pyramid': ['whistle_scene', 'generate_all_whistle_icons'],
+    # Master-based targets also depend on the banded decoder that reduces the master under a budget
+    'logo': ['tiled_decode', 'fix_ios_icon'],
+    'solid': ['tiled_decode', 'fix_ios_icon_solid'],
+    'whistle-crop': ['tiled_decode', 'fix_whistle_icon'],
+    'android': ['tiled_decode', 'android_formats', 'generate_android_icons'],
+    # Assembly of the web set; its renders come from the iOS style's modules
+    'web': ['android_formats', 'web_icons'],
+}
+
+# iOS styles drawn from the whistle scene alone, without the master logo
+MASTERLESS_STYLES = {'whistle', 'whistle-pyramid'}
+
+# iOS icon styles, each rendering (master, size) -> opaque RGB icon
+IOS_STYLES = {
+    'whistle': lambda logo, size: create_whistle_icon(size),
+    'whistle-pyramid': lambda logo, size: pyramid_whistle_icon(size),
+    'logo': render_app_icon,
+    'solid': render_solid_app_icon,
+    'whistle-crop': render_whistle_app_icon,
+}
+
+def timed_encode(image, profile, output=None, android_format='png'):
+    """Encode an image with the given profile, returning (bytes, encode seconds)"""
+    with asset_trace.stage('encode', output=output, profile=profile) as stage:
+        started = time.perf_counter()
+        data = encode_android_icon(image, android_format, profile)
+        stage.annotate(bytes=len(data))
+    return data, time.perf_counter() - started
+
+def render_ios_job(style, size, logo_path, profile='default', output=None):
+    """Render and encode one appiconset size (picklable for worker processes)"""
+    with asset_trace.stage('job', output=output):
+        with asset_trace.stage('render', style=style, size=size):
+            icon = IOS_STYLES[style](load_master(logo_path), size)
+        return timed_encode(icon, profile)
+
+def render_web_job(style, size, logo_path):
+    """Render one web icon size in the given style (picklable for worker processes)"""
+    with asset_trace.stage('render', style=style, size=size):
+        return IOS_STYLES[style](load_master(logo_path), size)
+
+def render_android_job(size, logo_path, profile='default', folder=None, android_format='png'):
+    """Render and encode the launcher variants of one density in the given backend"""
+    with asset_trace.stage('job', output=folder):
+        icons = render_android_icons(load_master(logo_path), size)
+        return {android_filename(filename, android_format): timed_encode(image, profile, filename, android_format)
+                for filename, image in icons.items()}
+
+def report_line(name, data, seconds):
+    return f"{name}: {len(data):,} bytes, encoded in {seconds * 1000:.1f} ms"
+
+def run_jobs(jobs, pool=None):
+    """Run (function, args) jobs serially or on a process pool, yielding results in job order
+
+    Results are yielded as they become ready, so the caller can queue one
+    job's writes while later jobs are still rendering.
+    """
+    if pool is None:
+        for function, args in jobs:
+            yield function(*args)
+        return
+    if not asset_trace.enabled():
+        futures = [pool.submit(function, *args) for function, args in jobs]
+        for future in futures:
+            yield future.result()
+        return
+
+    # Workers hand their trace events back alongside each result
+    futures = [pool.submit(asset_trace.collect, function, *args) for function, args in jobs]
+    for future in futures:
+        result, events = future.result()
+        asset_trace.merge(events)
+        yield result
+
+@lru_cache(maxsize=None)
+def generator_digest(target):
+    """Hash the sources a target renders with so any change to its code invalidates its outputs"""
+    sources = [importlib.import_module(name).__file__ for name in SHARED_MODULES + TARGET_MODULES[target]]
+    return cache_key(GENERATOR_VERSION, [sha256_file(path) for path in sources])
+
+def target_inputs(target, logo_path):
+    """Input hashes an iOS style or 'android' is built from"""
+    inputs = {'generator': generator_digest(target)}
+    if target not in MASTERLESS_STYLES:
+        inputs['master'] = sha256_file(logo_path)
+        if decodes_reduced(logo_path):
+            # Large masters render from a reduced working copy under a budget;
+            # a budget the master fits in changes nothing, so it stays out of the key
+            inputs['memory_budget'] = memory_budget()
+    return inputs
+
+def plan_ios_icons(style, logo_path, base_path=IOS_ICONSET_DIR, force=False, profile='default'):
+    """Return the manifest and the (size, filename, key) outputs that need rendering"""
+    manifest = load_manifest(base_path)
+    inputs = target_inputs(style, logo_path)
+    manifest['inputs'] = inputs
+
+    stale = []
+    for size, filename in IOS_ICON_SIZES:
+        key = cache_key(inputs, 'ios', style, size, profile)
+        if force or not is_fresh(manifest, base_path, filename, key):
+            stale.append((size, filename, key))
+    return manifest, stale
+
+def plan_android_icons(logo_path, res_dirs=ANDROID_RES_DIRS, force=False, profile='default', android_format='png'):
+    """Return per-tree manifests and the (folder, size, key) densities that need rendering"""
+    inputs = target_inputs('android', logo_path)
+    manifests = {}
+    for res_dir in res_dirs:
+        manifests[res_dir] = load_manifest(res_dir)
+        manifests[res_dir]['inputs'] = inputs
+
+    filenames = [android_filename(filename, android_format) for filename in ANDROID_ICON_NAMES]
+    stale = []
+    for folder, size in ANDROID_SIZES:
+        key = cache_key(inputs, 'android', size, profile, android_format)
+        if force or not all(is_fresh(manifest, res_dir, f"{folder}/{filename}", key)
+                            for res_dir, manifest in manifests.items()
+                            for filename in filenames):
+            stale.append((folder, size, key))
+    return manifests, stale
+
+def build_ios_icons(style='whistle', logo_path=MASTER_LOGO_PATH, base_path=IOS_ICONSET_DIR,
+                    pool=None, force=False, profile='default', link=False, writer=None):
+    """Render every out-of-date appiconset size in the given style
+
+    Filenames that share a pixel size are rendered and encoded once; the
+    other names get a copy (or hardlink) of the first.
+
+    Files are queued on writer (an OutputWriter) and are on disk once it is
+    flushed; without one, they are written before returning.
+    """
+    if writer is None:
+        with OutputWriter() as writer:
+            return build_ios_icons(style, logo_path, base_path, pool, force, profile, link, writer)
+    manifest, stale = plan_ios_icons(style, logo_path, base_path, force, profile)
+    by_size = {}
+    for size, filename, key in stale:
+        by_size.setdefault(size, []).append((filename, key))
+    jobs = [(render_ios_job, (style, size, logo_path, profile, outputs[0][0]))
+            for size, outputs in by_size.items()]
+
+    total_bytes = 0
+    for (size, outputs), (data, seconds) in zip(by_size.items(), run_jobs(jobs, pool)):
+        filename = outputs[0][0]
+        writer.write(os.path.join(base_path, filename), data,
+                     also=[os.path.join(base_path, name) for name, _ in outputs[1:]], link=link, output=filename)
+        for name, key in outputs:
+            record_output(manifest, name, key, data, manifest['inputs'])
+        total_bytes += len(data)
+        print(f"✅ Generated {report_line(', '.join(name for name, _ in outputs), data, seconds)}")
+
+    if stale:
+        save_manifest(base_path, manifest, writer)
+    if write_contents_json(base_path):
+        print(f"✅ Updated {os.path.join(base_path, 'Contents.json')}")
+    print(f"✅ iOS: {len(stale)} written from {len(by_size)} renders ({total_bytes:,} bytes, "
+          f"'{profile}' profile), {len(IOS_ICON_SIZES) - len(stale)} up to date")
+    return len(stale)
+
+def build_android_icons(logo_path=MASTER_LOGO_PATH, res_dirs=ANDROID_RES_DIRS, pool=None, force=False,
+                        profile='default', android_format='png', vector=False, writer=None):
+    """Render each out-of-date density once and write it into every Android res tree
+
+    android_format picks the raster backend ('png', 'webp' or 'webp-lossy');
+    copies of an icon in another format are removed so each resource has one
+    file. vector also writes the adaptive icon as VectorDrawables. writer
+    is used as in build_ios_icons.
+    """
+    if writer is None:
+        with OutputWriter() as writer:
+            return build_android_icons(logo_path, res_dirs, pool, force, profile, android_format, vector, writer)
+    manifests, stale = plan_android_icons(logo_path, res_dirs, force, profile, android_format)
+    jobs = [(render_android_job, (size, logo_path, profile, folder, android_format)) for folder, size, _ in stale]
+
+    total_bytes = 0
+    written = []
+    for (folder, size, key), icons in zip(stale, run_jobs(jobs, pool)):
+        for res_dir, manifest in manifests.items():
+            folder_path = os.path.join(res_dir, folder)
+            os.makedirs(folder_path, exist_ok=True)
+            for filename, (data, _) in icons.items():
+                writer.write(os.path.join(folder_path, filename), data, output=f"{folder}/{filename}")
+                written.append((folder_path, filename))
+                for other in {android_filename(filename, name) for name in ANDROID_FORMATS} - {filename}:
+                    manifest['outputs'].pop(f"{folder}/{other}", None)
+                record_output(manifest, f"{folder}/{filename}", key, data, manifest['inputs'])
+
+        print(f"✅ Generated {folder} ({size}x{size}) in {len(res_dirs)} res trees")
+        for filename, (data, seconds) in icons.items():
+            total_bytes += len(data)
+            print(f"   {report_line(filename, data, seconds)}")
+
+    if stale:
+        for res_dir, manifest in manifests.items():
+            save_manifest(res_dir, manifest, writer)
+        # Other formats of an icon go only once its replacement is on disk
+        writer.flush()
+        for folder_path, filename in written:
+            remove_other_formats(folder_path, filename)
+    print(f"✅ Android: {len(stale)} densities rendered ({total_bytes:,} bytes per res tree, "
+          f"{android_format}, '{profile}' profile), {len(ANDROID_SIZES) - len(stale)} up to date")
+
+    if vector:
+        for res_dir in res_dirs:
+            for name in write_adaptive_icon(res_dir, writer=writer):
+                print(f"✅ Updated {os.path.join(res_dir, name)}")
+        vector_bytes = sum(len(data) for data in adaptive_icon_files().values())
+        print(f"✅ Android adaptive icon: {vector_bytes:,} bytes of VectorDrawable per res tree (API 26+)")
+    return len(stale)
+
+def plan_web_icons(style, logo_path, base_path=WEB_ICON_DIR, force=False, profile='default', atlas=False):
+    """Return the manifest, the cache key and whether the web set needs rebuilding
+
+    The favicon and atlas are assembled from every size, so the set is
+    rebuilt as a whole when any of its files is stale.
+    """
+    manifest = load_manifest(base_path)
+    inputs = {**target_inputs(style, logo_path), 'web': generator_digest('web')}
+    manifest['inputs'] = inputs
+    key = cache_key(inputs, 'web', style, profile, atlas)
+    names = web_filenames(atlas, svg=style in MASTERLESS_STYLES)
+    stale = force or not all(is_fresh(manifest, base_path, name, key) for name in names)
+    return manifest, key, stale
+
+def build_web_icons(style='whistle', logo_path=MASTER_LOGO_PATH, base_path=WEB_ICON_DIR, pool=None, force=False,
+                    profile='default', atlas=False, writer=None):
+    """Render each web size once and assemble favicon.ico, the PWA icons and the optional atlas
+
+    writer is used as in build_ios_icons.
+    """
+    if writer is None:
+        with OutputWriter() as writer:
+            return build_web_icons(style, logo_path, base_path, pool, force, profile, atlas, writer)
+    manifest, key, stale = plan_web_icons(style, logo_path, base_path, force, profile, atlas)
+    if not stale:
+        print("✅ Web: up to date")
+        return 0
+
+    sizes = web_sizes()
+    images = dict(zip(sizes, run_jobs([(render_web_job, (style, size, logo_path)) for size in sizes], pool)))
+    # Whistle styles also get the scene as a vector favicon
+    svg = scene_svg(WHISTLE_SCENE) if style in MASTERLESS_STYLES else None
+    with asset_trace.stage('encode', output='web', profile=profile):
+        files = web_files(images, profile, atlas, svg)
+
+    os.makedirs(base_path, exist_ok=True)
+    # Drop files an earlier build made that this one does not (atlas, SVG favicon)
+    for filename in set(manifest['outputs']) - set(files):
+        if os.path.exists(os.path.join(base_path, filename)):
+            os.remove(os.path.join(base_path, filename))
+    manifest['outputs'] = {}
+    for filename, data in files.items():
+        writer.write(os.path.join(base_path, filename), data, output=filename)
+        record_output(manifest, filename, key, data, manifest['inputs'])
+        print(f"✅ Generated {filename}: {len(data):,} bytes")
+    save_manifest(base_path, manifest, writer)
+    print(f"✅ Web: {len(files)} files from {len(sizes)} renders ({sum(map(len, files.values())):,} bytes, "
+          f"'{profile}' profile); link them from index.html with:")
+    for link in head_links(svg=bool(svg)):
+        print(f"   {link}")
+    return len(files)
+
+def check_icons(ios_style='whistle', logo_path=MASTER_LOGO_PATH, profile='default', android_format='png'):
+    """Report outputs whose manifest no longer matches their inputs; True if all are current"""
+    _, ios_stale = plan_ios_icons(ios_style, logo_path, profile=profile)
+    _, android_stale = plan_android_icons(logo_path, profile=profile, android_format=android_format)
+
+    for _, filename, _ in ios_stale:
+        print(f"❌ Stale: {IOS_ICONSET_DIR / filename}")
+    for folder, _, _ in android_stale:
+        print(f"❌ Stale: {folder} launcher icons")
+
+    contents_path = IOS_ICONSET_DIR / 'Contents.json'
+    contents_stale = not contents_path.exists() or contents_path.read_text() != contents_json()
+    if contents_stale:
+        print(f"❌ Stale: {contents_path}")
+
+    if ios_stale or android_stale or contents_stale:
+        return False
+    print("✅ All generated icons are up to date")
+    return True
+
+def build_all_icons(ios_style='whistle', logo_path=MASTER_LOGO_PATH, workers=1, force=False,
+                    profile='default', link=False, android_format='png', vector=False, targets=BUILD_TARGETS[:2],
+                    atlas=False):
+    """Decode the master once and build the out-of-date icons of the given targets
+
+    targets is any of 'ios', 'android' and 'web'. With workers > 1 the render
+    and PNG encode jobs are spread over a process pool. Jobs are
+    deterministic and written in table order, so the output bytes do not
+    depend on the worker count. Outputs whose manifest entry matches the
+    current inputs are skipped unless force is set. Finished files are
+    written atomically by background threads while later ones render.
+    """
+    print(f"🎯 Building {', '.join(targets)} icons from a single master decode ({workers} workers)...")
+
+    pool = None
+    if workers > 1:
+        # Imported here: multiprocessing is only worth loading when a pool is used
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Decode before the pool starts so forked workers inherit the decoded master
+        load_master(logo_path)
+        pool = ProcessPoolExecutor(max_workers=workers)
+    # One writer for every target, so each folder is fsynced once per build
+    writer = OutputWriter()
+    try:
+        if 'ios' in targets:
+            build_ios_icons(ios_style, logo_path, pool=pool, force=force, profile=profile, link=link,
+                            writer=writer)
+        if 'android' in targets:
+            build_android_icons(logo_path, pool=pool, force=force, profile=profile,
+                                android_format=android_format, vector=vector, writer=writer)
+        if 'web' in targets:
+            build_web_icons(ios_style, logo_path, pool=pool, force=force, profile=profile, atlas=atlas,
+                            writer=writer)
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ios-style', choices=sorted(IOS_STYLES), default='whistle',
+                        help="design used for the iOS appiconset (default: whistle)")
+    parser.add_argument('--master', default=MASTER_LOGO_PATH,
+                        help="master logo to derive the icons from")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="render/encode processes, 1 for serial (default: all cores)")
+    parser.add_argument('--profile', choices=sorted(ENCODING_PROFILES), default='default',
+                        help="PNG encoding profile: 'dev' is fastest, 'release' is smallest")
+    parser.add_argument('--android-format', choices=sorted(ANDROID_FORMATS), default='png',
+                        help="launcher icon file format (default: png)")
+    parser.add_argument('--android-vector', action='store_true',
+                        help="also write a VectorDrawable adaptive icon (mipmap-anydpi-v26)")
+    parser.add_argument('--only', action='append', choices=BUILD_TARGETS,
+                        help="build just this target (repeatable, default: ios and android)")
+    parser.add_argument('--web', action='store_true',
+                        help="also build favicons and PWA icons into client/public in the iOS style")
+    parser.add_argument('--web-atlas', action='store_true',
+                        help="with --web, also pack every web size into one sprite atlas")
+    parser.add_argument('--force', action='store_true',
+                        help="re-render every output even if its manifest entry is current")
+    parser.add_argument('--trace', metavar='JSON',
+                        help="record per-stage timings and write them as a Chrome trace")
+    parser.add_argument('--link', action='store_true',
+                        help="hardlink iOS files that share a pixel size instead of copying them")
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help="decode masters larger than this in reduced bands (default: unbounded)")
+    parser.add_argument('--mask-cache', metavar='DIR',
+                        help="keep rasterized masks in DIR between runs")
+    parser.add_argument('--check', action='store_true',
+                        help="only report stale outputs; exit status 1 if any")
+    args = parser.parse_args()
+
+    # The budget is part of the cache key, so --check must see it too
+    if args.memory_budget:
+        set_memory_budget(args.memory_budget)
+    if args.check:
+        sys.exit(0 if check_icons(args.ios_style, args.master, args.profile, args.android_format) else 1)
+    if args.trace:
+        asset_trace.enable()
+    if args.mask_cache:
+        use_disk_cache(args.mask_cache)
+    targets = tuple(args.only or BUILD_TARGETS[:2] + (('web',) if args.web else ()))
+    build_all_icons(args.ios_style, args.master, max(1, args.workers), args.force, args.profile, args.link,
+                    args.android_format, args.android_vector, targets, args.web_atlas)
+    if args.trace:
+        asset_trace.write(args.trace)
+
+if __name__ == "__main__":
+    main()
@@ -4,137 +4,157 @@ Generate all iOS app icon sizes with the prominent whistle design
 Create all required icon sizes from the 1024px master
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+import argparse
+import io
+import json
 import os
 
+from PIL import Image, ImageChops, ImageStat
+
+from atomic_writer import OutputWriter, write_atomic
+from icon_assets import IOS_ICONSET_DIR
+from whistle_scene import WHISTLE_SCENE, render_scene, render_scene_sizes
+
+# AppIcon.appiconset slots as (idiom, size in points, scale, filename).
+# This table drives rendering and generates Contents.json; a file may fill several slots.
+IOS_ICON_SLOTS = [
+    ("iphone", "20x20", "2x", "Icon-20@2x.png"),
+    ("iphone", "20x20", "3x", "Icon-20@3x.png"),
+    ("iphone", "29x29", "2x", "Icon-29@2x.png"),
+    ("iphone", "29x29", "3x", "Icon-29@3x.png"),
+    ("iphone", "40x40", "2x", "Icon-40@2x.png"),
+    ("iphone", "40x40", "3x", "Icon-40@3x.png"),
+    ("iphone", "60x60", "2x", "Icon-120.png"),
+    ("iphone", "60x60", "3x", "Icon-180.png"),
+    ("ipad", "20x20", "1x", "Icon-20.png"),
+    ("ipad", "20x20", "2x", "Icon-20@2x.png"),
+    ("ipad", "29x29", "1x", "Icon-29.png"),
+    ("ipad", "29x29", "2x", "Icon-29@2x.png"),
+    ("ipad", "40x40", "1x", "Icon-40.png"),
+    ("ipad", "40x40", "2x", "Icon-40@2x.png"),
+    ("ipad", "76x76", "1x", "Icon-76.png"),
+    ("ipad", "76x76", "2x", "Icon-152.png"),
+    ("ipad", "83.5x83.5", "2x", "Icon-167.png"),  # iPad Pro
+    ("ios-marketing", "1024x1024", "1x", "Icon-1024.png"),  # App Store
+]
+
+def slot_pixels(points, scale):
+    """Pixel edge length of a slot, e.g. ("83.5x83.5", "2x") -> 167"""
+    return round(float(points.split('x')[0]) * int(scale.rstrip('x')))
+
+# Every icon file once, as (pixel size, filename)
+IOS_ICON_SIZES = list(dict.fromkeys(
+    (slot_pixels(points, scale), filename) for _, points, scale, filename in IOS_ICON_SLOTS))
+
+# Filenames sharing each pixel size; each size is rendered and encoded once
+IOS_ICON_FILES = {}
+for _size, _filename in IOS_ICON_SIZES:
+    IOS_ICON_FILES.setdefault(_size, []).append(_filename)
+
+# Supersampled resolution the pyramid mode renders the whistle at
+PYRAMID_MASTER_SIZE = 2048
+
 def create_whistle_icon(size):
     """Create a whistle icon at the specified size"""
-    # IH Academy brand colors
-    primary_blue = (32, 54, 107)    # #20366B
-    secondary_blue = (39, 141, 212) # #278DD4
-    
-    # Create background with gradient
-    icon = Image.new('RGB', (size, size), primary_blue)
-    draw = ImageDraw.Draw(icon)
-    
-    # Create gradient background
-    for i in range(size):
-        ratio = i / size
-        r = int(primary_blue[0] * (1 - ratio) + secondary_blue[0] * ratio)
-        g = int(primary_blue[1] * (1 - ratio) + secondary_blue[1] * ratio)
-        b = int(primary_blue[2] * (1 - ratio) + secondary_blue[2] * ratio)
-        draw.line([(0, i), (size, i)], fill=(r, g, b))
-    
-    # Scale whistle elements based on icon size
-    scale = size / 1024
-    
-    # Whistle body (main tube)
-    whistle_color = 'white'
-    body_left = int(300 * scale)
-    body_top = int(450 * scale)
-    body_right = int(700 * scale)
-    body_bottom = int(550 * scale)
-    radius = max(1, int(50 * scale))
-    
-    draw.rounded_rectangle([body_left, body_top, body_right, body_bottom], 
-                          radius=radius, fill=whistle_color)
-    
-    # Whistle mouthpiece
-    mouth_left = int(250 * scale)
-    mouth_top = int(470 * scale)
-    mouth_right = int(320 * scale)
-    mouth_bottom = int(530 * scale)
-    mouth_radius = max(1, int(20 * scale))
-    
-    draw.rounded_rectangle([mouth_left, mouth_top, mouth_right, mouth_bottom], 
-                          radius=mouth_radius, fill=whistle_color)
-    
-    # Sound holes (only for larger icons)
-    if size >= 64:
-        hole_width = max(1, int(8 * scale))
-        hole_spacing = int(60 * scale)
-        hole_start = int(350 * scale)
-        hole_end = int(650 * scale)
-        hole_top = int(420 * scale)
-        hole_bottom = int(440 * scale)
-        
-        for x in range(hole_start, hole_end, hole_spacing):
-            draw.line([(x, hole_top), (x, hole_bottom)], fill=whistle_color, width=hole_width)
-    
-    # Whistle ring (only for larger icons)
-    if size >= 40:
-        ring_left = int(680 * scale)
-        ring_top = int(430 * scale)
-        ring_right = int(750 * scale)
-        ring_bottom = int(500 * scale)
-        ring_width = max(1, int(12 * scale))
-        
-        draw.ellipse([ring_left, ring_top, ring_right, ring_bottom], 
-                    outline=whistle_color, width=ring_width)
-        
-        # Inner ring
-        inner_offset = int(10 * scale)
-        inner_width = max(1, int(8 * scale))
-        draw.ellipse([ring_left + inner_offset, ring_top + inner_offset, 
-                     ring_right - inner_offset, ring_bottom - inner_offset], 
-                    outline=whistle_color, width=inner_width)
-    
-    # Sound lines (only for larger icons)
-    if size >= 60:
-        sound_start_x = int(320 * scale)
-        sound_y_center = int(480 * scale)
-        sound_width = max(1, int(6 * scale))
-        
-        for i, length in enumerate([40, 30, 20]):
-            y_offset = int((-15 + i * 15) * scale)
-            line_length = int(length * scale)
-            draw.line([(sound_start_x, sound_y_center + y_offset), 
-                      (sound_start_x + line_length, sound_y_center + y_offset)], 
-                     fill=whistle_color, width=sound_width)
-    
-    # Add border for larger icons
-    if size >= 60:
-        border_width = max(1, int(8 * scale))
-        draw.ellipse([border_width, border_width, size-border_width, size-border_width], 
-                    outline='white', width=border_width)
-    
-    return icon
-
-def generate_all_ios_icons():
+    # Geometry, colors and the small-size detail rules live in whistle_scene
+    return render_scene(WHISTLE_SCENE, size)
+
+@lru_cache(maxsize=4)
+def whistle_pyramid(master_size=PYRAMID_MASTER_SIZE):
+    """Render the whistle once at master_size and halve it down to the smallest icon
+
+    Each level is reduced from the level above it, so the shapes and gradient
+    are only rasterized once for the whole icon set.
+    """
+    levels = [create_whistle_icon(master_size)]
+    smallest = min(size for size, _ in IOS_ICON_SIZES)
+    while levels[-1].width // 2 >= smallest:
+        levels.append(levels[-1].reduce(2))
+    return tuple(levels)
+
+@lru_cache(maxsize=None)
+def pyramid_whistle_icon(size, master_size=PYRAMID_MASTER_SIZE):
+    """Create a whistle icon by resampling the nearest larger pyramid level"""
+    levels = whistle_pyramid(master_size)
+    source = min((level for level in levels if level.width >= size), key=lambda level: level.width)
+    if source.width == size:
+        return source
+    return source.resize((size, size), Image.Resampling.LANCZOS)
+
+def compare_pyramid_with_direct():
+    """Print per-size pixel differences between pyramid and direct rendering"""
+    print("🔍 Comparing pyramid output against direct rendering...")
+
+    for size in sorted(IOS_ICON_FILES):
+        direct = create_whistle_icon(size)
+        diff = ImageChops.difference(pyramid_whistle_icon(size), direct)
+        max_error = max(high for _, high in diff.getextrema())
+        mean_error = sum(ImageStat.Stat(diff).mean) / 3
+        print(f"   {size:>4}px  max error {max_error:>3}  mean error {mean_error:6.2f}")
+
+def contents_json():
+    """Return the appiconset Contents.json for IOS_ICON_SLOTS in Xcode's formatting"""
+    contents = {
+        'images': [
+            {'filename': filename, 'idiom': idiom, 'scale': scale, 'size': points}
+            for idiom, points, scale, filename in IOS_ICON_SLOTS
+        ],
+        'info': {'author': 'xcode', 'version': 1},
+    }
+    return json.dumps(contents, indent=2, separators=(',', ' : '), sort_keys=True)
+
+def write_contents_json(folder=IOS_ICONSET_DIR):
+    """Write Contents.json if it differs from the slot table; True if it was rewritten"""
+    path = os.path.join(folder, 'Contents.json')
+    text = contents_json()
+    try:
+        with open(path) as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    write_atomic(path, text.encode())
+    return True
+
+def generate_all_ios_icons(pyramid=False, link=False):
     """Generate all required iOS icon sizes"""
-    base_path = "mobile/ios-xcode-project/IHAcademy/Assets.xcassets/AppIcon.appiconset/"
-    
-    # iOS icon sizes and their filenames
-    icon_sizes = [
-        (20, "Icon-20.png"),
-        (40, "Icon-20@2x.png"),  # 20pt @2x
-        (60, "Icon-20@3x.png"),  # 20pt @3x
-        (29, "Icon-29.png"),
-        (58, "Icon-29@2x.png"),  # 29pt @2x
-        (87, "Icon-29@3x.png"),  # 29pt @3x
-        (40, "Icon-40.png"),
-        (80, "Icon-40@2x.png"),  # 40pt @2x
-        (120, "Icon-40@3x.png"), # 40pt @3x
-        (120, "Icon-60@2x.png"), # 60pt @2x
-        (180, "Icon-60@3x.png"), # 60pt @3x
-        (76, "Icon-76.png"),
-        (152, "Icon-76@2x.png"), # 76pt @2x
-        (167, "Icon-83.5@2x.png"), # 83.5pt @2x (iPad Pro)
-        (1024, "Icon-1024.png")  # App Store
-    ]
-    
-    print("🎯 Generating all iOS icon sizes with whistle design...")
-    
-    for size, filename in icon_sizes:
-        icon = create_whistle_icon(size)
-        output_path = os.path.join(base_path, filename)
-        icon.save(output_path, 'PNG')
-        print(f"✅ Generated {filename} ({size}x{size})")
-    
-    print(f"✅ All {len(icon_sizes)} icon sizes generated successfully!")
+    mode = f"{PYRAMID_MASTER_SIZE}px pyramid" if pyramid else "direct rendering"
+    print(f"🎯 Generating all iOS icon sizes with whistle design ({mode})...")
+
+    if pyramid:
+        icons = {size: pyramid_whistle_icon(size) for size in IOS_ICON_FILES}
+    else:
+        icons = render_scene_sizes(WHISTLE_SCENE, IOS_ICON_FILES)
+
+    # Each distinct size is encoded once and fanned out to its other filenames;
+    # the writer threads put one size on disk while the next is encoded
+    with OutputWriter() as writer:
+        for size, filenames in IOS_ICON_FILES.items():
+            buffer = io.BytesIO()
+            icons[size].save(buffer, 'PNG')
+            writer.write(IOS_ICONSET_DIR / filenames[0], buffer.getvalue(),
+                         also=[IOS_ICONSET_DIR / filename for filename in filenames[1:]], link=link)
+            print(f"✅ Generated {', '.join(filenames)} ({size}x{size})")
+
+    if write_contents_json():
+        print("✅ Updated Contents.json")
+    print(f"✅ All {len(IOS_ICON_SIZES)} icons generated from {len(IOS_ICON_FILES)} renders!")
     print("✅ All icons feature prominent whistle design")
     print("✅ All icons are completely opaque (Apple compliant)")
     print("✅ Ready for Xcode build and App Store submission")
 
 if __name__ == "__main__":
-    generate_all_ios_icons()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate all iOS app icon sizes with the whistle design")
+    parser.add_argument('--pyramid', action='store_true',
+                        help=f"render once at {PYRAMID_MASTER_SIZE}px and downsample every size from it")
+    parser.add_argument('--compare', action='store_true',
+                        help="only report differences between pyramid and direct rendering")
+    parser.add_argument('--link', action='store_true',
+                        help="hardlink files that share a pixel size instead of copying them")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_pyramid_with_direct()
+    else:
+        generate_all_ios_icons(pyramid=args.pyramid, link=args.link)
@@ -1,57 +1,93 @@
 #!/usr/bin/env python3
 """
-Generate Android 15 compliant AAB file using bundletool
+Generate Android 15 compliant AAB file in-process, without bundletool or a JVM
 Updated to target API level 35 for Google Play Console compliance
+
+Several variants (staging and production, other version codes) can be built
+in one run. Entries that are the same in every variant, such as resources,
+are compressed once and their compressed bytes copied into each bundle, so
+only the manifest and metadata are compressed per variant.
 """
 
+import argparse
+import io
+import json
 import os
-import subprocess
-import shutil
+import re
+import struct
+import sys
+import time
+import zipfile
+import zlib
 from pathlib import Path
+from xml.sax.saxutils import escape
 
-def generate_android_15_aab():
-    """Generate AAB file with Android 15 (API 35) compliance"""
-    
-    print("🎯 Generating Android 15 (API level 35) compliant AAB...")
-    
-    # Paths
-    project_dir = "mobile/android-studio-package"
-    output_dir = "mobile"
-    aab_filename = "ih-academy-android15-compliant.aab"
-    
-    # Check if bundletool exists
-    if not shutil.which("bundletool"):
-        print("⚠️ bundletool not found. Installing...")
-        # Download bundletool if needed
-        os.system("wget -O bundletool.jar https://github.com/google/bundletool/releases/download/1.15.6/bundletool-all-1.15.6.jar")
-        bundletool_cmd = "java -jar bundletool.jar"
-    else:
-        bundletool_cmd = "bundletool"
-    
-    # Create base AAB structure
-    base_dir = f"{project_dir}/app/build/intermediates/aab_base"
-    os.makedirs(base_dir, exist_ok=True)
-    
-    # Copy essential files to base structure
-    manifest_content = '''<?xml version="1.0" encoding="utf-8"?>
+from atomic_writer import write_atomic
+from icon_assets import ANDROID_RES_DIRS
+from validate_aab import check_bundle, report
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# The launcher icon the build scripts generate into the main Android project, in
+# whichever format the last build wrote (it deletes the other, see android_formats)
+DEFAULT_ICON_DIR = ANDROID_RES_DIRS[0] / "mipmap-xxxhdpi"
+DEFAULT_ICON_NAMES = ("ic_launcher.png", "ic_launcher.webp")
+
+# Resource density qualifiers and their dpi, for resources.pb configurations
+DENSITY_DPI = {'ldpi': 120, 'mdpi': 160, 'hdpi': 240, 'xhdpi': 320, 'xxhdpi': 480, 'xxxhdpi': 640}
+
+# Every entry carries the same timestamp so identical inputs give identical bytes
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+# Already-compressed formats are stored; deflating them again only costs time
+STORED_EXTENSIONS = ('.png', '.webp', '.jpg', '.jpeg', '.gif', '.ogg', '.mp3', '.mp4')
+
+# The variant a single build packages; a variant matrix entry overrides any of these keys
+DEFAULT_VARIANT = {
+    'name': None,
+    'application_id': "africa.itshappening.ihacademy",
+    'label': "IH Academy",
+    'version_code': 2,
+    'version_name': "1.0.1",
+    'min_sdk': 21,
+    'target_sdk': 35,
+    'compile_sdk': 35,
+}
+
+VARIANT_INT_KEYS = ('version_code', 'min_sdk', 'target_sdk', 'compile_sdk')
+VARIANT_TEXT_KEYS = ('label', 'version_name')
+VARIANT_NAME_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+APPLICATION_ID_PATTERN = re.compile(r'^[A-Za-z][A-Za-z0-9_]*(\.[A-Za-z][A-Za-z0-9_]*)+$')
+
+# Recorded in BUNDLE-METADATA and BundleConfig.pb as the tools the bundle matches
+AGP_VERSION = "8.3.2"
+BUNDLETOOL_VERSION = "1.15.6"
+
+# Android releases by API level, for the summary printed after a build
+ANDROID_RELEASES = {33: "Android 13", 34: "Android 14", 35: "Android 15", 36: "Android 16"}
+
+# Filled in per variant by manifest_xml(), which escapes every value for a double-quoted attribute
+MANIFEST_XML = '''<?xml version="1.0" encoding="utf-8"?>
 <manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    package="africa.itshappening.ihacademy">
-    
+    package="{application_id}"
+    android:versionCode="{version_code}"
+    android:versionName="{version_name}">
+
     <uses-permission android:name="android.permission.INTERNET" />
     <uses-permission android:name="android.permission.ACCESS_NETWORK_STATE" />
-    
+
     <uses-sdk
-        android:minSdkVersion="21"
-        android:targetSdkVersion="35"
-        android:compileSdkVersion="35" />
-    
+        android:minSdkVersion="{min_sdk}"
+        android:targetSdkVersion="{target_sdk}"
+        android:compileSdkVersion="{compile_sdk}" />
+
     <application
         android:allowBackup="true"
         android:icon="@mipmap/ic_launcher"
-        android:label="IH Academy"
+        android:label="{label}"
         android:theme="@style/Theme.IHAcademy"
         android:exported="true">
-        
+
         <activity
             android:name=".MainActivity"
             android:exported="true"
@@ -63,64 +99,257 @@ def generate_android_15_aab():
         </activity>
     </application>
 </manifest>'''
-    
-    # Write updated manifest with API 35
-    with open(f"{base_dir}/AndroidManifest.xml", "w") as f:
-        f.write(manifest_content)
-    
-    # Copy icon resources
-    icon_dir = f"{base_dir}/res/mipmap-xxxhdpi"
-    os.makedirs(icon_dir, exist_ok=True)
-    
-    # Copy the whistle icon if it exists
-    if os.path.exists("mobile/icons/ic_launcher_xxxhdpi.png"):
-        shutil.copy2("mobile/icons/ic_launcher_xxxhdpi.png", f"{icon_dir}/ic_launcher.png")
-    
-    # Create BundleConfig.pb for proper AAB structure
-    bundle_config = f"{base_dir}/BundleConfig.pb"
-    with open(bundle_config, "wb") as f:
-        # Simple protobuf structure for bundletool
-        f.write(b'\x08\x01')  # Basic bundle configuration
-    
-    # Create the AAB using zip (since we have the structure)
-    aab_path = f"{output_dir}/{aab_filename}"
-    
+
+def proto_field(field, value):
+    """Encode one protobuf field: ints as varints, bytes, str and nested messages length-delimited"""
+    if isinstance(value, int):
+        return proto_varint(field << 3) + proto_varint(value)
+    if isinstance(value, str):
+        value = value.encode()
+    return proto_varint(field << 3 | 2) + proto_varint(len(value)) + value
+
+def proto_varint(value):
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append(value & 0x7F | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+# BundleConfig { bundletool { version: BUNDLETOOL_VERSION } } in protobuf wire format
+# (the old b'\x08\x01' put a varint in the message field bundletool parses)
+BUNDLE_CONFIG_PB = proto_field(1, proto_field(2, BUNDLETOOL_VERSION))
+
+def resource_table(package_name, resource_paths):
+    """aapt2's resources.pb (a ResourceTable) declaring module files such as 'res/mipmap-xxxhdpi/ic_launcher.png'
+
+    Field numbers follow frameworks/base/tools/aapt2/Resources.proto and
+    Configuration.proto; only file resources with an optional density
+    qualifier are supported.
+    """
+    types = {}
+    for path in resource_paths:
+        _, folder, filename = path.split('/')
+        resource_type, _, qualifier = folder.partition('-')
+        types.setdefault(resource_type, {}).setdefault(filename.split('.')[0], []).append((qualifier, path))
+
+    package = proto_field(1, proto_field(1, 0x7F)) + proto_field(2, package_name)
+    for type_id, (resource_type, entries) in enumerate(types.items(), 1):
+        message = proto_field(1, proto_field(1, type_id)) + proto_field(2, resource_type)
+        for entry_id, (name, files) in enumerate(entries.items()):
+            entry = proto_field(1, proto_field(1, entry_id)) + proto_field(2, name)
+            for qualifier, path in files:
+                # Configuration.density = 18; FileReference {path = 1, type = 2 (PNG = 1)}
+                config = proto_field(18, DENSITY_DPI[qualifier]) if qualifier else b''
+                file_type = 1 if path.endswith('.png') else 0
+                item = proto_field(5, proto_field(1, path) + proto_field(2, file_type))
+                # ConfigValue {config = 1, value = 2}; Value.item = 4
+                entry += proto_field(6, proto_field(1, config) + proto_field(2, proto_field(4, item)))
+            message += proto_field(3, entry)
+        package += proto_field(3, message)
+    return proto_field(2, package)
+
+def manifest_xml(variant=DEFAULT_VARIANT):
+    return MANIFEST_XML.format(**{key: escape(str(value), {'"': "&quot;"}) for key, value in variant.items()})
+
+def app_metadata(variant=DEFAULT_VARIANT):
+    """BUNDLE-METADATA's app metadata JSON; every value is a string"""
+    return json.dumps({
+        "android_gradle_plugin_version": AGP_VERSION,
+        "app_version_code": str(variant['version_code']),
+        "app_version_name": variant['version_name'],
+        "target_sdk_version": str(variant['target_sdk']),
+        "compile_sdk_version": str(variant['compile_sdk']),
+        "bundle_tool_version": BUNDLETOOL_VERSION,
+    }, indent=4)
+
+def android_release(api_level):
+    """'Android 15 (API level 35)', or just the API level for releases not in ANDROID_RELEASES"""
+    if api_level in ANDROID_RELEASES:
+        return f"{ANDROID_RELEASES[api_level]} (API level {api_level})"
+    return f"API level {api_level}"
+
+def parse_variant(entry):
+    """Validate one variant matrix entry and return it with the defaults filled in"""
+    name = entry.get('name') or ''
+    if not VARIANT_NAME_PATTERN.match(name):
+        raise ValueError(f"invalid variant name {name!r}: use lowercase letters, digits, '-' and '_'")
+    unknown = sorted(set(entry) - set(DEFAULT_VARIANT))
+    if unknown:
+        raise ValueError(f"{name}: unknown keys {', '.join(unknown)}")
+    variant = {**DEFAULT_VARIANT, **entry}
+    for key in VARIANT_INT_KEYS:
+        if not isinstance(variant[key], int) or variant[key] < 1:
+            raise ValueError(f"{name}: {key} must be a positive integer")
+    for key in VARIANT_TEXT_KEYS:
+        if not isinstance(variant[key], str) or not variant[key].strip():
+            raise ValueError(f"{name}: {key} must be a non-empty string")
+    if not APPLICATION_ID_PATTERN.match(variant['application_id']):
+        raise ValueError(f"{name}: invalid application_id {variant['application_id']!r}")
+    return variant
+
+def load_variants(path):
+    """Read and validate a variant matrix file; names must be unique"""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('variants', [])
+    variants = [parse_variant(entry) for entry in data]
+    names = [variant['name'] for variant in variants]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate variant names: {', '.join(duplicates)}")
+    return variants
+
+def aab_filename(variant=DEFAULT_VARIANT):
+    if variant['name'] is None:
+        return "ih-academy-android15-compliant.aab"
+    return f"ih-academy-android15-{variant['name']}.aab"
+
+def default_icon_path():
+    """The generated launcher icon that exists, PNG first; the PNG path if there is none"""
+    for name in DEFAULT_ICON_NAMES:
+        if (DEFAULT_ICON_DIR / name).exists():
+            return DEFAULT_ICON_DIR / name
+    return DEFAULT_ICON_DIR / DEFAULT_ICON_NAMES[0]
+
+def bundle_entries(icon_path=None, variant=DEFAULT_VARIANT):
+    """Return the bundle's (archive name, bytes or source path) entries in archive order"""
+    entries = [
+        ("base/manifest/AndroidManifest.xml", manifest_xml(variant).encode()),
+        ("BundleConfig.pb", BUNDLE_CONFIG_PB),
+    ]
+
+    # Add the whistle icon if it exists, declared in the module's resource table
+    # under the extension of the file supplied
+    if icon_path and os.path.exists(icon_path):
+        icon_resource = f"res/mipmap-xxxhdpi/ic_launcher{os.path.splitext(icon_path)[1].lower()}"
+        entries.append((f"base/{icon_resource}", Path(icon_path)))
+        entries.append(("base/resources.pb", resource_table(variant['application_id'], [icon_resource])))
+
+    entries.append(("BUNDLE-METADATA/com.android.tools.build.gradle/app-metadata.properties",
+                    app_metadata(variant).encode()))
+    return entries
+
+def bundle_entry_info(name):
+    """Zip header for an entry, independent of build time and host OS"""
+    info = zipfile.ZipInfo(name, date_time=ZIP_TIMESTAMP)
+    info.create_system = 3  # Unix
+    info.external_attr = 0o644 << 16
+    if name.lower().endswith(STORED_EXTENSIONS):
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+def compress_entry(name, data):
+    """Compress one entry as it is stored in the archive: (ZipInfo with CRC and sizes, stored bytes)"""
+    if isinstance(data, Path):
+        data = data.read_bytes()
+    info = bundle_entry_info(name)
+    if info.compress_type == zipfile.ZIP_DEFLATED:
+        # Raw deflate at zipfile's default level
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+        stored = compressor.compress(data) + compressor.flush()
+    else:
+        stored = data
+    info.CRC = zlib.crc32(data)
+    info.file_size = len(data)
+    info.compress_size = len(stored)
+    return info, stored
+
+def zip_headers(info, offset):
+    """Return the (local file header, central directory record) of an entry written at offset"""
+    name = info.filename.encode('utf-8')
+    flags = 0 if name.isascii() else 0x800  # UTF-8 name
+    year, month, day, hour, minute, second = info.date_time
+    dos_date = (year - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    fields = (flags, info.compress_type, dos_time, dos_date, info.CRC, info.compress_size, info.file_size,
+              len(name))
+    local = struct.pack('<4s5H3I2H', b'PK\x03\x04', 20, *fields, 0) + name
+    central = struct.pack('<4s6H3I5H2I', b'PK\x01\x02', info.create_system << 8 | 20, 20, *fields,
+                          0, 0, 0, 0, info.external_attr, offset) + name
+    return local, central
+
+def assemble_bundle(entries, compressed=None):
+    """Build a reproducible AAB archive in memory from entries and return its bytes
+
+    compressed caches each entry's stored form by (name, contents): bundles
+    assembled with the same cache copy the stored bytes of the entries they
+    share instead of compressing them again.
+    """
+    compressed = {} if compressed is None else compressed
+    archive = io.BytesIO()
+    central = []
+    for name, data in entries:
+        if (name, data) not in compressed:
+            compressed[name, data] = compress_entry(name, data)
+        info, stored = compressed[name, data]
+        local, record = zip_headers(info, archive.tell())
+        archive.write(local)
+        archive.write(stored)
+        central.append(record)
+
+    directory = b''.join(central)
+    offset = archive.tell()
+    if offset + len(directory) > 0xFFFFFFFF or len(central) > 0xFFFF:
+        raise ValueError("zip64 bundles are not supported")
+    archive.write(directory)
+    archive.write(struct.pack('<4s4H2IH', b'PK\x05\x06', 0, 0, len(central), len(central), len(directory),
+                              offset, 0))
+    return archive.getvalue()
+
+def write_bundle(aab_path, entries, compressed=None):
+    """Assemble entries into an AAB archive that replaces aab_path atomically"""
+    write_atomic(aab_path, assemble_bundle(entries, compressed))
+
+def build_variant(variant, output_dir, icon_path, validate=True, compressed=None):
+    """Build and optionally validate one variant's bundle; returns its path, or None if it is invalid
+
+    The archive is checked in memory, so an invalid bundle never replaces
+    the one already on disk.
+    """
+    aab_path = f"{output_dir}/{aab_filename(variant)}"
+
+    # Manifest, resource table, bundle config, icon and metadata go straight into the zip
+    data = assemble_bundle(bundle_entries(icon_path, variant), compressed)
+
+    # Check the bundle structure in-process instead of starting bundletool
+    if validate and not report(aab_path, check_bundle(data)):
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    write_atomic(aab_path, data)
+    return aab_path
+
+def warn_missing_icon(icon_path):
+    if not icon_path or not os.path.exists(icon_path):
+        print(f"⚠️ Launcher icon {icon_path} not found, packaging without it")
+
+def generate_android_15_aab(output_dir=REPO_ROOT / "mobile",
+                            icon_path=None,
+                            validate=True, variant=DEFAULT_VARIANT):
+    """Generate AAB file with Android 15 (API 35) compliance; icon_path defaults to default_icon_path()"""
+    icon_path = icon_path or default_icon_path()
+
+    print(f"🎯 Generating {android_release(variant['target_sdk'])} compliant AAB...")
+    warn_missing_icon(icon_path)
     print("📦 Creating AAB structure...")
-    
-    # Use Python to create the AAB zip structure
-    import zipfile
-    
-    with zipfile.ZipFile(aab_path, 'w', zipfile.ZIP_DEFLATED) as aab:
-        # Add manifest
-        aab.write(f"{base_dir}/AndroidManifest.xml", "base/manifest/AndroidManifest.xml")
-        
-        # Add bundle config
-        aab.write(f"{base_dir}/BundleConfig.pb", "BundleConfig.pb")
-        
-        # Add icon if exists
-        if os.path.exists(f"{icon_dir}/ic_launcher.png"):
-            aab.write(f"{icon_dir}/ic_launcher.png", "base/res/mipmap-xxxhdpi/ic_launcher.png")
-        
-        # Add metadata
-        metadata = f'''{{
-    "android_gradle_plugin_version": "8.3.2",
-    "app_version_code": "2",
-    "app_version_name": "1.0.1",
-    "target_sdk_version": "35",
-    "compile_sdk_version": "35",
-    "bundle_tool_version": "1.15.6"
-}}'''
-        aab.writestr("BUNDLE-METADATA/com.android.tools.build.gradle/app-metadata.properties", metadata)
-    
+
+    aab_path = build_variant(variant, output_dir, icon_path, validate)
+    if aab_path is None:
+        print("❌ AAB failed structural validation")
+        return False
+
     # Verify the AAB was created
     if os.path.exists(aab_path):
         file_size = os.path.getsize(aab_path) / 1024  # Size in KB
-        print(f"✅ Android 15 compliant AAB created successfully!")
+        print(f"✅ {ANDROID_RELEASES.get(variant['target_sdk'], 'Android')} compliant AAB created successfully!")
         print(f"✅ File: {aab_path}")
         print(f"✅ Size: {file_size:.1f} KB")
-        print(f"✅ Target SDK: Android 15 (API level 35)")
-        print(f"✅ Version: 1.0.1 (Code: 2)")
-        print(f"✅ AGP Version: 8.3.2")
+        print(f"✅ Target SDK: {android_release(variant['target_sdk'])}")
+        print(f"✅ Version: {variant['version_name']} (Code: {variant['version_code']})")
+        print(f"✅ AGP Version: {AGP_VERSION}")
         print(f"✅ Google Play Console compliant")
         print("")
         print("📱 Ready for Google Play Console upload!")
@@ -130,5 +359,49 @@ def generate_android_15_aab():
         print("❌ Failed to create AAB file")
         return False
 
+def generate_variants(variants, output_dir=REPO_ROOT / "mobile",
+                      icon_path=None, validate=True):
+    """Build one bundle per variant, compressing the entries they share once; True if all are valid"""
+    icon_path = icon_path or default_icon_path()
+    print(f"🎯 Generating {len(variants)} Android 15 AAB variants...")
+    warn_missing_icon(icon_path)
+    started = time.perf_counter()
+    compressed = {}
+    failed = 0
+    for variant in variants:
+        aab_path = build_variant(variant, output_dir, icon_path, validate, compressed)
+        if aab_path is None:
+            print(f"❌ {variant['name']}: AAB failed structural validation")
+            failed += 1
+            continue
+        print(f"✅ {variant['name']}: {aab_path} ({os.path.getsize(aab_path) / 1024:.1f} KB, "
+              f"{variant['application_id']} {variant['version_name']} (Code: {variant['version_code']}), "
+              f"target SDK {variant['target_sdk']})")
+
+    entries = sum(len(bundle_entries(icon_path, variant)) for variant in variants)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"🎯 {len(variants)} bundles in {elapsed:.1f} ms: {len(compressed)} entries compressed, "
+          f"{entries - len(compressed)} copied from earlier bundles")
+    return not failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate an Android 15 (API 35) compliant AAB")
+    parser.add_argument('--output', default=REPO_ROOT / "mobile", help="folder the .aab is written to")
+    parser.add_argument('--icon', help="launcher icon packed as mipmap-xxxhdpi/ic_launcher (PNG or WebP, "
+                                       "default: the one the icon build generated)")
+    parser.add_argument('--variants', metavar='JSON',
+                        help="build one bundle per variant listed in this file instead of the default one")
+    parser.add_argument('--no-validate', action='store_true', help="skip the structural validation")
+    args = parser.parse_args()
+
+    if args.variants:
+        try:
+            variants = load_variants(args.variants)
+        except (OSError, ValueError) as e:
+            print(f"❌ {args.variants}: {e}")
+            sys.exit(1)
+        sys.exit(0 if generate_variants(variants, args.output, args.icon, not args.no_validate) else 1)
+    sys.exit(0 if generate_android_15_aab(args.output, args.icon, not args.no_validate) else 1)
+
 if __name__ == "__main__":
-    generate_android_15_aab()
\ No newline at end of file
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Generate Android launcher icons from the IH Academy 6 whistle logo
+Creates ic_launcher, ic_launcher_round and ic_launcher_foreground for every density
+"""
+
+from PIL import Image, ImageDraw
+import argparse
+import os
+
+import asset_trace
+from android_formats import ANDROID_FORMATS, android_filename, encode_android_icon, remove_other_formats
+from atomic_writer import OutputWriter
+# The density and file tables live in icon_assets so lint can read them without Pillow
+from icon_assets import ANDROID_ICON_NAMES, ANDROID_RES_DIRS, ANDROID_SIZES, MASTER_LOGO_PATH, load_master
+from icon_masks import ellipse_mask
+
+def load_logo():
+    """Load the IH Academy 6 whistle logo, falling back to a drawn placeholder"""
+    try:
+        if os.path.exists(MASTER_LOGO_PATH):
+            return load_master()
+        print("Logo not found, creating placeholder whistle icon")
+    except Exception as e:
+        print(f"Error loading logo: {e}")
+    return create_whistle_icon()
+
+def render_android_icons(logo, size):
+    """Render the three launcher icon variants for one density"""
+    # Create launcher icon
+    with asset_trace.stage('resize', output="ic_launcher.png"):
+        icon = logo.resize((size, size), Image.Resampling.LANCZOS)
+
+    # Create round icon
+    with asset_trace.stage('render', output="ic_launcher_round.png"):
+        round_icon = create_round_icon(icon, size)
+
+    # Create foreground icon for adaptive icons
+    with asset_trace.stage('render', output="ic_launcher_foreground.png"):
+        foreground = create_foreground_icon(logo, size)
+
+    return {
+        "ic_launcher.png": icon,
+        "ic_launcher_round.png": round_icon,
+        "ic_launcher_foreground.png": foreground,
+    }
+
+def create_android_icons(logo=None, base_path=ANDROID_RES_DIRS[0], android_format='png'):
+    """Generate all required Android app icons from IH Academy 6 whistle logo"""
+
+    # Load the original IH Academy 6 whistle logo
+    if logo is None:
+        logo = load_logo()
+
+    # Create directories and icons
+    os.makedirs(base_path, exist_ok=True)
+
+    # Each density is written by the writer threads while the next one renders
+    written = []
+    with OutputWriter() as writer:
+        for folder, size in ANDROID_SIZES:
+            folder_path = os.path.join(base_path, folder)
+            os.makedirs(folder_path, exist_ok=True)
+
+            total = 0
+            for filename, image in render_android_icons(logo, size).items():
+                filename = android_filename(filename, android_format)
+                data = encode_android_icon(image, android_format)
+                writer.write(os.path.join(folder_path, filename), data, output=f"{folder}/{filename}")
+                written.append((folder_path, filename))
+                total += len(data)
+
+            print(f"Created icons for {folder} ({size}x{size}, {android_format}, {total:,} bytes)")
+
+    # Other formats of an icon go only once its replacement is on disk
+    for folder_path, filename in written:
+        remove_other_formats(folder_path, filename)
+
+    print("Android icons generated successfully!")
+
+def create_whistle_icon():
+    """Create whistle icon if original logo not available"""
+    size = 512
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    # IH Academy colors
+    primary_color = "#20366B"
+    secondary_color = "#278DD4"
+    accent_color = "#24D367"
+
+    # Draw whistle shape
+    center = size // 2
+    whistle_radius = size // 3
+
+    # Main whistle body
+    draw.ellipse([
+        center - whistle_radius, center - whistle_radius//2,
+        center + whistle_radius, center + whistle_radius//2
+    ], fill=primary_color)
+
+    # Whistle mouthpiece
+    draw.ellipse([
+        center - whistle_radius//3, center - whistle_radius//4,
+        center + whistle_radius//3, center + whistle_radius//4
+    ], fill=secondary_color)
+
+    # Whistle ring
+    draw.ellipse([
+        center + whistle_radius//2, center - whistle_radius//6,
+        center + whistle_radius, center + whistle_radius//6
+    ], fill=accent_color)
+
+    return img
+
+def create_round_icon(icon, size):
+    """Create round version of icon"""
+    # Anti-aliased circle, rasterized once per size and shared across res trees
+    mask = ellipse_mask(size)
+
+    with asset_trace.stage('composite'):
+        round_icon = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        round_icon.paste(icon, (0, 0))
+        round_icon.putalpha(mask)
+
+    return round_icon
+
+def create_foreground_icon(logo, size):
+    """Create foreground icon for adaptive icons"""
+    # Adaptive icons need extra padding (about 25% on each side)
+    padding = size // 4
+    fg_size = size - (padding * 2)
+
+    foreground = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    with asset_trace.stage('resize'):
+        resized_logo = logo.resize((fg_size, fg_size), Image.Resampling.LANCZOS)
+
+    # Center the logo
+    with asset_trace.stage('composite'):
+        foreground.paste(resized_logo, (padding, padding), resized_logo if resized_logo.mode == 'RGBA' else None)
+
+    return foreground
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Android launcher icons from the IH Academy 6 whistle logo")
+    parser.add_argument('--format', choices=sorted(ANDROID_FORMATS), default='png',
+                        help="launcher icon file format (default: png)")
+    args = parser.parse_args()
+
+    create_android_icons(android_format=args.format)
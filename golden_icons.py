@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Compare generated iOS and Android icons against stored golden references
+Per-pixel max/mean error and a blurred-luma perceptual score, each with per-asset tolerances
+
+Icons are rendered in memory with the build's own job functions, so the check
+follows the current code whatever the files on disk hold; --files compares
+the generated files instead. Byte-identical icons are accepted without
+decoding; the rest are measured with Pillow's whole-image C operations
+(difference, getextrema, ImageStat, histogram), never per pixel in Python. A
+diff image is written only for assets that fail.
+"""
+
+from fnmatch import fnmatch
+import argparse
+import io
+import os
+import shutil
+import sys
+import time
+
+from PIL import Image, ImageChops, ImageFilter, ImageStat
+
+from android_formats import ANDROID_FORMATS, android_filename
+from build_icons import render_android_job, render_ios_job
+from generate_all_whistle_icons import IOS_ICON_FILES, IOS_ICON_SIZES
+from generate_android_icons import ANDROID_ICON_NAMES, ANDROID_SIZES
+from icon_assets import ANDROID_RES_DIRS, IOS_ICONSET_DIR, MASTER_LOGO_PATH, REPO_ROOT
+
+GOLDEN_DIR = REPO_ROOT / "golden"
+DIFF_DIR = REPO_ROOT / ".golden-diff"
+
+# The iOS style the golden references are recorded in (the build's default)
+GOLDEN_STYLE = 'whistle'
+
+# Luma difference (after a 1px blur) a viewer is taken to notice
+PERCEPTUAL_THRESHOLD = 4
+
+# (max channel error, mean channel error, % of pixels with a noticeable luma change)
+DEFAULT_TOLERANCE = (8, 0.5, 0.1)
+
+# Per-asset overrides, matched against the golden name in order
+TOLERANCES = [
+    # The App Store icon is reviewed by Apple; keep it tight
+    ("ios/Icon-1024.png", (4, 0.1, 0.05)),
+    # Anti-aliased round masks shift by a subpixel between rasterizer versions
+    ("android/*/ic_launcher_round.png", (32, 0.75, 0.5)),
+]
+
+def tolerance_for(name):
+    for pattern, tolerance in TOLERANCES:
+        if fnmatch(name, pattern):
+            return tolerance
+    return DEFAULT_TOLERANCE
+
+def icon_outputs(android_format='png'):
+    """Yield (golden name, generated path) for every icon a build in android_format writes"""
+    for _, filename in IOS_ICON_SIZES:
+        yield f"ios/{filename}", IOS_ICONSET_DIR / filename
+    # Every res tree holds the same icons, so they share one golden set; the
+    # goldens are PNGs whatever format the launcher icons are written in
+    for res_dir in ANDROID_RES_DIRS:
+        for folder, _ in ANDROID_SIZES:
+            for filename in ANDROID_ICON_NAMES:
+                yield f"android/{folder}/{filename}", res_dir / folder / android_filename(filename, android_format)
+
+def file_icons(android_format='png'):
+    """Yield (golden name, label, bytes or None if missing) for the generated files"""
+    for name, path in icon_outputs(android_format):
+        label = os.path.relpath(path)
+        if not os.path.exists(path):
+            yield name, label, None
+            continue
+        with open(path, 'rb') as f:
+            yield name, label, f.read()
+
+def rendered_icons(logo_path=MASTER_LOGO_PATH, android_format='png'):
+    """Yield (golden name, label, bytes) for every icon a build writes, rendered in memory"""
+    for size, filenames in IOS_ICON_FILES.items():
+        data, _ = render_ios_job(GOLDEN_STYLE, size, logo_path)
+        for filename in filenames:
+            yield f"ios/{filename}", f"ios/{filename} (rendered)", data
+    for folder, size in ANDROID_SIZES:
+        icons = render_android_job(size, logo_path, folder=folder, android_format=android_format)
+        for filename in ANDROID_ICON_NAMES:
+            output = android_filename(filename, android_format)
+            yield f"android/{folder}/{filename}", f"android/{folder}/{output} (rendered)", icons[output][0]
+
+def perceptual_luma(image):
+    """Luma as seen on a mid-grey background, softened so 1px edge jitter is ignored"""
+    flat = Image.new('RGB', image.size, (128, 128, 128))
+    flat.paste(image, (0, 0), image)
+    return flat.convert('L').filter(ImageFilter.GaussianBlur(1))
+
+def visible_rgba(image):
+    """RGBA copy with the color of fully transparent pixels cleared
+
+    Encoders may keep or drop the color under alpha 0 (lossless WebP drops
+    it), and it is never seen.
+    """
+    image = image.convert('RGBA')
+    visible = image.getchannel('A').point(lambda value: 255 if value else 0)
+    return Image.composite(image, Image.new('RGBA', image.size, (0, 0, 0, 0)), visible)
+
+def compare_images(generated, golden):
+    """Return {'max', 'mean', 'perceptual'} for two same-sized images, plus the raw difference"""
+    generated = visible_rgba(generated)
+    golden = visible_rgba(golden)
+    diff = ImageChops.difference(generated, golden)
+    # Every channel counts, not just alpha (getbbox's default for RGBA)
+    changed = diff.getbbox(alpha_only=False)
+    if changed is None:
+        return {'max': 0, 'mean': 0.0, 'perceptual': 0.0}, diff
+    max_error = max(high for _, high in diff.getextrema())
+    mean_error = sum(ImageStat.Stat(diff).mean) / 4
+
+    # Only the changed region (plus the blur radius) can hold a luma change
+    left, top, right, bottom = changed
+    region = (max(0, left - 3), max(0, top - 3), min(diff.width, right + 3), min(diff.height, bottom + 3))
+    luma_diff = ImageChops.difference(perceptual_luma(generated.crop(region)),
+                                      perceptual_luma(golden.crop(region)))
+    noticeable = sum(luma_diff.histogram()[PERCEPTUAL_THRESHOLD + 1:])
+    perceptual = 100 * noticeable / (diff.width * diff.height)
+    return {'max': max_error, 'mean': mean_error, 'perceptual': perceptual}, diff
+
+def write_diff(name, generated, golden, diff, diff_dir=DIFF_DIR):
+    """Save golden | generated | amplified difference side by side"""
+    path = os.path.join(diff_dir, name.replace('/', '__'))
+    os.makedirs(diff_dir, exist_ok=True)
+    width, height = diff.size
+    sheet = Image.new('RGBA', (width * 3, height), (255, 255, 255, 255))
+    sheet.paste(golden.convert('RGBA'), (0, 0))
+    sheet.paste(generated.convert('RGBA'), (width, 0))
+    amplified = diff.convert('RGB').point(lambda value: min(255, value * 8))
+    sheet.paste(amplified, (width * 2, 0))
+    sheet.save(path)
+    return path
+
+def check_golden(icons, golden_dir=GOLDEN_DIR, diff_dir=DIFF_DIR):
+    """Compare (golden name, label, bytes or None) icons with their goldens; True if all are within tolerance"""
+    started = time.perf_counter()
+    if os.path.isdir(diff_dir):
+        shutil.rmtree(diff_dir)
+
+    missing = 0
+    differing = 0
+    compared = 0
+    # Results by (golden name, icon bytes): the Android res trees hold identical copies
+    passed = set()
+    for name, label, data in icons:
+        golden_path = os.path.join(golden_dir, name)
+        if not os.path.exists(golden_path):
+            print(f"❌ {name}: no golden reference (run with --update)")
+            missing += 1
+            continue
+        if data is None:
+            print(f"❌ {label}: not generated")
+            missing += 1
+            continue
+
+        compared += 1
+        if (name, data) in passed:
+            continue
+        with open(golden_path, 'rb') as f:
+            if f.read() == data:
+                # Same encoder output, nothing to decode
+                passed.add((name, data))
+                continue
+
+        with Image.open(io.BytesIO(data)) as generated, Image.open(golden_path) as golden:
+            if generated.size != golden.size:
+                print(f"❌ {label}: {generated.size} does not match golden {golden.size}")
+                differing += 1
+                continue
+            metrics, diff = compare_images(generated, golden)
+            max_error, mean_error, perceptual = tolerance_for(name)
+            if (metrics['max'] <= max_error and metrics['mean'] <= mean_error
+                    and metrics['perceptual'] <= perceptual):
+                passed.add((name, data))
+                continue
+            diff_path = write_diff(name, generated, golden, diff, diff_dir)
+
+        differing += 1
+        print(f"❌ {label}: max {metrics['max']} (≤{max_error}), "
+              f"mean {metrics['mean']:.3f} (≤{mean_error}), "
+              f"perceptual {metrics['perceptual']:.3f}% (≤{perceptual}%)")
+        print(f"   diff: {os.path.relpath(diff_path)}")
+
+    elapsed = (time.perf_counter() - started) * 1000
+    if differing:
+        print(f"❌ {differing} of {compared} compared icons differ from golden ({elapsed:.0f} ms)")
+    if missing:
+        print(f"❌ {missing} icons or golden references missing")
+    if differing or missing:
+        return False
+    print(f"✅ {compared} icons match golden references ({elapsed:.0f} ms)")
+    return True
+
+def update_golden(golden_dir=GOLDEN_DIR, logo_path=MASTER_LOGO_PATH):
+    """Record freshly rendered icons as the new golden references"""
+    recorded = set()
+    for name, _, data in rendered_icons(logo_path):
+        if name in recorded:
+            continue
+        target = os.path.join(golden_dir, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        recorded.add(name)
+    print(f"✅ Recorded {len(recorded)} golden references in {os.path.relpath(golden_dir)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--update', action='store_true',
+                        help="record freshly rendered icons as the golden references")
+    parser.add_argument('--files', action='store_true',
+                        help="compare the generated files on disk instead of rendering in memory")
+    parser.add_argument('--master', default=MASTER_LOGO_PATH, help="master logo to render from")
+    parser.add_argument('--android-format', choices=sorted(ANDROID_FORMATS), default='png',
+                        help="launcher icon format the build writes (default: png); webp-lossy is not expected "
+                             "to stay within the golden thresholds")
+    parser.add_argument('--golden', default=GOLDEN_DIR, help="golden reference folder")
+    args = parser.parse_args()
+
+    if args.update:
+        update_golden(args.golden, args.master)
+    else:
+        if args.files:
+            icons = file_icons(args.android_format)
+        else:
+            icons = rendered_icons(args.master, args.android_format)
+        sys.exit(0 if check_golden(icons, args.golden) else 1)
+
+if __name__ == "__main__":
+    main()
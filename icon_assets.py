@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Shared asset locations and master logo loading for the icon scripts
+Paths resolve from the repository root so every script runs from any directory
+
+Pillow is imported by the functions that decode or draw, so tools that only
+need the paths and size tables (the CLI, lint, the bundle tools) start fast.
+"""
+
+from array import array
+from functools import lru_cache
+from pathlib import Path
+import os
+
+import asset_trace
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+# The IH Academy 6 whistle logo every raster icon is derived from
+MASTER_LOGO_PATH = REPO_ROOT / "attached_assets" / "IH Academy 6 (1).png"
+
+IOS_ICONSET_DIR = REPO_ROOT / "mobile/ios-xcode-project/IHAcademy/Assets.xcassets/AppIcon.appiconset"
+
+# IH Academy brand colors
+PRIMARY_BLUE = (32, 54, 107)    # #20366B
+SECONDARY_BLUE = (39, 141, 212) # #278DD4
+
+# Longest edge a master is reduced to when decoding it whole would exceed the
+# memory budget (ICON_MEMORY_BUDGET, in MiB); every icon is 1024px or smaller
+MASTER_WORKING_SIZE = 2048
+
+# Android launcher icon densities as (mipmap folder, pixel size)
+ANDROID_SIZES = [
+    ("mipmap-mdpi", 48),
+    ("mipmap-hdpi", 72),
+    ("mipmap-xhdpi", 96),
+    ("mipmap-xxhdpi", 144),
+    ("mipmap-xxxhdpi", 192)
+]
+
+# Files written into every mipmap folder
+ANDROID_ICON_NAMES = ["ic_launcher.png", "ic_launcher_round.png", "ic_launcher_foreground.png"]
+
+# Android source trees that carry their own copy of the launcher mipmaps
+ANDROID_RES_DIRS = [
+    REPO_ROOT / "mobile/android/app/src/main/res",
+    REPO_ROOT / "mobile/android-project/app/src/main/res",
+    REPO_ROOT / "mobile/android-studio-package/app/src/main/res",
+    REPO_ROOT / "mobile/android-studio-package/app-icons",
+]
+
+
+def memory_budget():
+    """Bytes a master decode may use, from ICON_MEMORY_BUDGET (MiB); None if unbounded"""
+    budget = os.environ.get('ICON_MEMORY_BUDGET')
+    return int(float(budget) * 1024 * 1024) if budget else None
+
+
+def set_memory_budget(megabytes):
+    """Bound master decoding for this process and the workers it starts"""
+    os.environ['ICON_MEMORY_BUDGET'] = str(megabytes)
+
+
+def load_master(path=MASTER_LOGO_PATH):
+    """Return the decoded master logo as RGBA, decoding each file only once per run
+
+    Under a memory budget, a master too large to decode whole is reduced
+    while it is decoded to a working copy of about MASTER_WORKING_SIZE px.
+    The returned image is shared between callers, so treat it as read-only
+    (resize/convert/copy before drawing on it).
+    """
+    return _decode_master(Path(path).resolve(), memory_budget())
+
+
+def decode_logo(path):
+    """Decode a logo like load_master() does, without keeping it in the master cache
+
+    For logos needed only briefly, such as one organisation's in a batch; the
+    caller owns the returned image.
+    """
+    return _decode(Path(path).resolve(), memory_budget())
+
+
+def decodes_reduced(path=MASTER_LOGO_PATH):
+    """True if load_master(path) returns a reduced working copy under the current budget (reads the header only)"""
+    budget = memory_budget()
+    if budget is None:
+        return False
+    from PIL import Image
+
+    with Image.open(path) as logo:
+        return not _fits_budget(logo.size, budget)
+
+
+def _fits_budget(size, budget):
+    width, height = size
+    return budget is None or width * height * 4 <= budget
+
+
+def forget_masters():
+    """Drop every decoded master so the next load_master() reads the file again"""
+    _decode_master.cache_clear()
+
+
+def _decode(path, budget=None):
+    from PIL import Image
+    from tiled_decode import open_reduced
+
+    with asset_trace.stage('decode', source=path.name), Image.open(path) as logo:
+        if _fits_budget(logo.size, budget):
+            # Palette logos carry a tRNS chunk; expand it once so every target
+            # resizes with real alpha instead of nearest-neighbour palette indices
+            return logo.convert('RGBA')
+
+    with asset_trace.stage('decode-tiled', source=path.name, budget=budget):
+        reduced = open_reduced(path, MASTER_WORKING_SIZE, budget)
+        return reduced if reduced.mode == 'RGBA' else reduced.convert('RGBA')
+
+
+_decode_master = lru_cache(maxsize=None)(_decode)
+
+
+def flatten_on(image, background='white'):
+    """Composite an image onto a solid background and return an opaque RGB copy"""
+    from PIL import Image
+
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    flat = Image.new('RGB', image.size, background)
+    flat.paste(image, (0, 0), image)
+    return flat
+
+
+def vertical_gradient(start, end, size):
+    """Return a size x size RGB image fading from start (top) to end (bottom)
+
+    Built as one column of row colours broadcast across the width in a single
+    resize, instead of a draw.line call per row. The column is a row-index
+    ramp mapped to each channel by Pillow's linear point(), so no per-row
+    Python runs; each row equals the old per-row lerp or is one level off it
+    where float rounding differs. Results are cached by (start, end, size); copy()
+    the image before drawing on it.
+    """
+    with asset_trace.stage('gradient'):
+        return _gradient(tuple(start), tuple(end), size)
+
+
+@lru_cache(maxsize=64)
+def _gradient(start, end, size):
+    from PIL import Image
+
+    # 32-bit column holding each row's index, 0 at the top
+    rows = Image.frombytes('I', (1, size), array('i', range(size)).tobytes())
+    channels = [rows.point(lambda i, a=a, b=b: i * ((b - a) / size) + a).convert('L') for a, b in zip(start, end)]
+    return Image.merge('RGB', channels).resize((size, size), Image.Resampling.NEAREST)
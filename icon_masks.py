@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Anti-aliased ellipse masks shared by the icon renderers
+Each mask is rasterized once per run, supersampled, and optionally kept on disk between runs
+
+Set ICON_MASK_CACHE=<dir> (or call use_disk_cache()) to persist masks; worker
+processes inherit the variable and share the same directory.
+"""
+
+from functools import lru_cache
+import os
+
+import PIL
+from PIL import Image, ImageDraw
+
+import asset_trace
+from asset_cache import cache_key
+
+# Masks are drawn at SUPERSAMPLE x the target size and box-filtered down
+SUPERSAMPLE = 4
+
+# Bump when the rasterization changes so stale masks on disk are ignored
+MASK_VERSION = 1
+
+
+def use_disk_cache(path):
+    """Load and save masks under path for this process and its workers"""
+    os.makedirs(path, exist_ok=True)
+    os.environ['ICON_MASK_CACHE'] = str(path)
+
+
+def ellipse_mask(size, box=None, width=0):
+    """Return a size x size 'L' mask with an anti-aliased ellipse
+
+    box is (left, top, right, bottom) in pixel-edge coordinates and defaults
+    to the whole canvas; width > 0 draws a ring of that many pixels inside
+    the box instead of a filled ellipse. The mask is shared between callers,
+    so use it only as a paste/putalpha mask.
+    """
+    box = tuple(box) if box else (0, 0, size, size)
+    with asset_trace.stage('mask', size=size):
+        return _ellipse_mask(size, box, width)
+
+
+def paint_ellipse(image, fill, box=None, width=0):
+    """Draw an anti-aliased ellipse (or ring) onto a square image in place"""
+    image.paste(fill, (0, 0), ellipse_mask(image.width, box, width))
+
+
+@lru_cache(maxsize=256)
+def _ellipse_mask(size, box, width):
+    key = cache_key('ellipse', MASK_VERSION, PIL.__version__, SUPERSAMPLE, size, box, width)
+    folder = os.environ.get('ICON_MASK_CACHE')
+    path = os.path.join(folder, f"{key}.png") if folder else None
+
+    if path and os.path.exists(path):
+        with Image.open(path) as cached:
+            if cached.mode == 'L' and cached.size == (size, size):
+                cached.load()
+                return cached
+
+    mask = _rasterize(size, box, width)
+    if path:
+        # Write then rename so parallel workers never read a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        mask.save(temp_path, 'PNG')
+        os.replace(temp_path, path)
+    return mask
+
+
+def _rasterize(size, box, width):
+    scale = SUPERSAMPLE
+    left, top, right, bottom = box
+    large = Image.new('L', (size * scale, size * scale), 0)
+    draw = ImageDraw.Draw(large)
+    # Pixel edges map to the first and last covered subsample
+    outline = [left * scale, top * scale, right * scale - 1, bottom * scale - 1]
+    if width:
+        draw.ellipse(outline, outline=255, width=width * scale)
+    else:
+        draw.ellipse(outline, fill=255)
+    return large.reduce(scale)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the icon, web and bundle tooling
+Each subcommand imports its tool only when it runs, so light commands never load Pillow
+
+    python icons.py build -j4          every iOS and Android icon
+    python icons.py lint               header-only icon checks
+    python icons.py aab --help         options of one subcommand
+"""
+
+import importlib
+import sys
+
+# Subcommand -> (tool module with a main(), arguments put before the user's, summary)
+COMMANDS = {
+    'build': ('build_icons', [], "build every out-of-date iOS and Android icon (--web adds the web set)"),
+    'ios': ('build_icons', ['--only', 'ios'], "build only the iOS appiconset"),
+    'android': ('build_icons', ['--only', 'android'], "build only the Android launcher icons"),
+    'web': ('build_icons', ['--only', 'web'], "build only the favicons and PWA icons"),
+    'check': ('build_icons', ['--check'], "report stale outputs without building (exit 1 if any)"),
+    'aab': ('generate_android_15_aab', [], "package the Android 15 App Bundle (--variants for a variant matrix)"),
+    'validate-aab': ('validate_aab', [], "check App Bundle structure without bundletool"),
+    'lint': ('lint_icons', [], "lint appiconsets and mipmap trees from PNG headers"),
+    'golden': ('golden_icons', [], "compare generated icons with the golden references"),
+    'bench': ('benchmark_icons', [], "benchmark the generators against a saved baseline"),
+    'watch': ('watch_icons', [], "rebuild affected icons whenever a source changes"),
+    'brand': ('brand_icons', [], "generate branded icon sets for many organisations"),
+    'index': ('index_assets', [], "index and thumbnail attached_assets"),
+}
+
+def usage():
+    lines = ["usage: icons.py <command> [options]", "", "commands:"]
+    lines += [f"  {name:<13} {summary}" for name, (_, _, summary) in COMMANDS.items()]
+    lines += ["", "Run 'icons.py <command> --help' for the options of a command."]
+    return '\n'.join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+    command, *args = argv
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n\n{usage()}")
+        return 2
+
+    module, prefix, _ = COMMANDS[command]
+    # Every tool parses sys.argv itself; the program name shows in its --help
+    sys.argv = [f"icons.py {command}", *prefix, *args]
+    return importlib.import_module(module).main()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Build a thumbnail and metadata index for the reference files in attached_assets
+JPEGs decode in draft mode and large images shrink with reduce() before any filtered resize
+
+The index keeps each file's size, mtime, SHA-256 and pixel dimensions in one
+compact JSON file. Files whose size and mtime are unchanged are skipped on the
+next run; thumbnails are named by content hash, so renamed or duplicate files
+share one.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import io
+import json
+import os
+import time
+
+from PIL import Image
+
+from asset_cache import sha256_bytes
+from icon_assets import REPO_ROOT, flatten_on
+
+ASSET_DIR = REPO_ROOT / "attached_assets"
+INDEX_DIR = REPO_ROOT / ".asset-index"
+INDEX_NAME = "index.json"
+
+# Longest thumbnail edge in pixels
+THUMB_SIZE = 256
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp')
+
+def make_thumbnail(image, thumb_size=THUMB_SIZE):
+    """Downscale an opened image to fit thumb_size, doing the bulk of the work at low cost"""
+    # JPEG: let libjpeg decode straight to 1/2, 1/4 or 1/8 scale
+    image.draft('RGB', (thumb_size, thumb_size))
+    if image.mode not in ('RGB', 'RGBA', 'L'):
+        # Palette and other modes cannot be box-reduced directly
+        image = image.convert('RGBA')
+    # Integer box reduction to within 2x of the target, then a short bicubic pass
+    factor = max(1, max(image.size) // thumb_size)
+    if factor > 1:
+        image = image.reduce(factor)
+    if image.mode == 'RGBA':
+        image = flatten_on(image, 'white')
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.thumbnail((thumb_size, thumb_size), Image.Resampling.BICUBIC, reducing_gap=None)
+    return image
+
+def index_file(path, thumb_dir, thumb_size=THUMB_SIZE):
+    """Hash one file and, for images, record its dimensions and write its thumbnail"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    stat = os.stat(path)
+    entry = {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256_bytes(data),
+    }
+    if not path.lower().endswith(IMAGE_EXTENSIONS):
+        return entry
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            entry.update(width=image.width, height=image.height, format=image.format, mode=image.mode)
+            thumb_name = f"{entry['sha256'][:16]}.jpg"
+            thumb_path = os.path.join(thumb_dir, thumb_name)
+            if not os.path.exists(thumb_path):
+                make_thumbnail(image, thumb_size).save(thumb_path, 'JPEG', quality=80)
+            entry['thumb'] = thumb_name
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        entry['error'] = str(e)
+    return entry
+
+def load_index(index_dir=INDEX_DIR):
+    try:
+        with open(os.path.join(index_dir, INDEX_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'thumb_size': THUMB_SIZE, 'files': {}}
+
+def save_index(index, index_dir=INDEX_DIR):
+    path = os.path.join(index_dir, INDEX_NAME)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(index, f, separators=(',', ':'), sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+def is_unchanged(entry, path, thumb_dir):
+    """True if the file's size and mtime match its entry and its thumbnail still exists"""
+    if not entry:
+        return False
+    stat = os.stat(path)
+    if (stat.st_size, stat.st_mtime_ns) != (entry['size'], entry['mtime_ns']):
+        return False
+    return 'thumb' not in entry or os.path.exists(os.path.join(thumb_dir, entry['thumb']))
+
+def index_assets(asset_dir=ASSET_DIR, index_dir=INDEX_DIR, workers=1, thumb_size=THUMB_SIZE, force=False):
+    """Index every file in asset_dir, re-processing only new or modified files"""
+    started = time.perf_counter()
+    thumb_dir = os.path.join(index_dir, 'thumbs')
+    os.makedirs(thumb_dir, exist_ok=True)
+
+    index = load_index(index_dir)
+    if force or index.get('thumb_size') != thumb_size:
+        index = {'thumb_size': thumb_size, 'files': {}}
+    previous = index['files']
+
+    names = sorted(name for name in os.listdir(asset_dir)
+                   if not name.startswith('.') and os.path.isfile(os.path.join(asset_dir, name)))
+    stale = [name for name in names
+             if not is_unchanged(previous.get(name), os.path.join(asset_dir, name), thumb_dir)]
+    jobs = [(os.path.join(asset_dir, name), thumb_dir, thumb_size) for name in stale]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(index_file, *zip(*jobs)))
+    else:
+        entries = [index_file(*job) for job in jobs]
+
+    files = {name: previous[name] for name in names if name not in stale}
+    files.update(zip(stale, entries))
+    index['files'] = files
+    save_index(index, index_dir)
+
+    # Drop thumbnails no indexed file refers to any more
+    referenced = {entry['thumb'] for entry in files.values() if 'thumb' in entry}
+    for thumb in os.listdir(thumb_dir):
+        if thumb not in referenced:
+            os.remove(os.path.join(thumb_dir, thumb))
+
+    for name, entry in zip(stale, entries):
+        if 'error' in entry:
+            print(f"❌ {name}: {entry['error']}")
+    images = sum(1 for entry in files.values() if 'thumb' in entry)
+    print(f"✅ Indexed {len(stale)} new or changed files, {len(names) - len(stale)} unchanged "
+          f"({images} thumbnails) in {time.perf_counter() - started:.2f} s")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--assets', default=ASSET_DIR, help="folder to index")
+    parser.add_argument('--index', default=INDEX_DIR, help="where the index and thumbnails are written")
+    parser.add_argument('--size', type=int, default=THUMB_SIZE, help="longest thumbnail edge in pixels")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="indexing processes, 1 for serial (default: all cores)")
+    parser.add_argument('--force', action='store_true', help="re-index every file")
+    args = parser.parse_args()
+
+    index_assets(args.assets, args.index, max(1, args.workers), args.size, args.force)
+
+if __name__ == "__main__":
+    main()
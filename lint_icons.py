@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Lint every appiconset and mipmap tree for App Store / Google Play icon requirements
+Reads only the PNG signature, IHDR, PLTE and tRNS chunks, so no pixel data is decoded
+
+WebP launcher icons (build_icons --android-format webp) are checked from
+their RIFF header and first VP8/VP8L/VP8X chunk the same way.
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+
+from icon_assets import ANDROID_ICON_NAMES, ANDROID_SIZES, REPO_ROOT
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Image files a mipmap folder may hold a launcher icon in
+MIPMAP_EXTENSIONS = ('.png', '.webp')
+
+# Bit depths the PNG spec allows for each color type
+COLOR_TYPES = {
+    0: ('grayscale', (1, 2, 4, 8, 16)),
+    2: ('RGB', (8, 16)),
+    3: ('palette', (1, 2, 4, 8)),
+    4: ('grayscale+alpha', (8, 16)),
+    6: ('RGBA', (8, 16)),
+}
+
+ANDROID_DENSITY_SIZES = dict(ANDROID_SIZES)
+
+# Launcher icon resource names, whatever file format holds them
+ANDROID_ICON_RESOURCES = {os.path.splitext(filename)[0] for filename in ANDROID_ICON_NAMES}
+
+# Adaptive icon foregrounds may use the full 108dp layer instead of the 48dp launcher size
+ADAPTIVE_FOREGROUND = "ic_launcher_foreground"
+
+# Folders that never hold shipped icons
+SKIP_DIRS = {'node_modules', '.git', 'build', 'Pods'}
+
+class PNGHeaderError(Exception):
+    """The file does not start with a well-formed PNG header"""
+
+class WebPHeaderError(Exception):
+    """The file does not start with a well-formed WebP header"""
+
+def read_png_header(path):
+    """Return the IHDR fields plus palette/transparency info, stopping at the first IDAT"""
+    with open(path, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise PNGHeaderError("not a PNG file")
+        chunk = f.read(8)
+        if chunk != b'\0\0\0\x0dIHDR':
+            raise PNGHeaderError("first chunk is not IHDR")
+        ihdr = f.read(13)
+        if len(ihdr) != 13:
+            raise PNGHeaderError("truncated IHDR chunk")
+        width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', ihdr)
+        header = {
+            'width': width,
+            'height': height,
+            'bit_depth': bit_depth,
+            'color_type': color_type,
+            'interlaced': bool(interlace),
+            'palette_entries': None,
+            'transparency': False,
+        }
+        f.seek(4, os.SEEK_CUR)  # IHDR CRC
+
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise PNGHeaderError("file ends before any image data")
+            length, chunk_type = struct.unpack('>I4s', chunk)
+            if chunk_type in (b'IDAT', b'IEND'):
+                break
+            if chunk_type == b'PLTE':
+                header['palette_entries'] = length // 3
+            elif chunk_type == b'tRNS':
+                header['transparency'] = True
+            f.seek(length + 4, os.SEEK_CUR)
+    return header
+
+def read_webp_header(path):
+    """Return {'width', 'height', 'encoding', 'alpha'} from a WebP's RIFF header and first chunk"""
+    with open(path, 'rb') as f:
+        head = f.read(30)
+    if len(head) < 16 or head[:4] != b'RIFF' or head[8:12] != b'WEBP':
+        raise WebPHeaderError("not a WebP file")
+    chunk = head[12:16]
+    data = head[20:]
+    if chunk == b'VP8X' and len(data) >= 10:
+        # Flags (alpha is bit 4), 3 reserved bytes, then 24-bit canvas width-1 and height-1
+        width = int.from_bytes(data[4:7], 'little') + 1
+        height = int.from_bytes(data[7:10], 'little') + 1
+        return {'width': width, 'height': height, 'encoding': 'extended', 'alpha': bool(data[0] & 0x10)}
+    if chunk == b'VP8L' and len(data) >= 5 and data[0] == 0x2F:
+        # 14-bit width-1 and height-1, then the alpha_is_used hint
+        bits = int.from_bytes(data[1:5], 'little')
+        return {'width': (bits & 0x3FFF) + 1, 'height': (bits >> 14 & 0x3FFF) + 1, 'encoding': 'lossless',
+                'alpha': bool(bits >> 28 & 1)}
+    if chunk == b'VP8 ' and len(data) >= 10 and data[3:6] == b'\x9d\x01\x2a':
+        # Key frame tag and start code, then 14-bit width and height (the top bits are scaling)
+        width, height = struct.unpack('<HH', data[6:10])
+        return {'width': width & 0x3FFF, 'height': height & 0x3FFF, 'encoding': 'lossy', 'alpha': False}
+    raise WebPHeaderError(f"unsupported or truncated first chunk {chunk!r}")
+
+def has_alpha(header):
+    return header['color_type'] in (4, 6) or header['transparency']
+
+def describe(header):
+    name = COLOR_TYPES.get(header['color_type'], ('unknown',))[0]
+    if header['transparency']:
+        name += '+tRNS'
+    return f"{header['width']}x{header['height']} {name} {header['bit_depth']}-bit"
+
+def check_png(path, expected_sizes=(), alpha=None):
+    """Return (severity, message) problems for one PNG from its header alone
+
+    expected_sizes lists the accepted square edge lengths (any if empty);
+    alpha is the severity ('error' or 'warning') to report transparency with,
+    or None when transparency is allowed.
+    """
+    try:
+        header = read_png_header(path)
+    except (OSError, PNGHeaderError) as e:
+        return [('error', str(e))]
+
+    problems = []
+    name, depths = COLOR_TYPES.get(header['color_type'], (None, ()))
+    if name is None:
+        return [('error', f"invalid color type {header['color_type']}")]
+    if header['bit_depth'] not in depths:
+        problems.append(('error', f"bit depth {header['bit_depth']} is invalid for {name}"))
+    elif header['bit_depth'] != 8 and header['color_type'] != 3:
+        problems.append(('warning', f"{header['bit_depth']}-bit {name}; icons are expected to be 8-bit"))
+    if header['color_type'] == 3:
+        if header['palette_entries'] is None:
+            problems.append(('error', "palette image has no PLTE chunk"))
+        elif header['palette_entries'] > 2 ** header['bit_depth']:
+            problems.append(('error', f"PLTE has {header['palette_entries']} entries for a "
+                                      f"{header['bit_depth']}-bit palette"))
+
+    problems.extend(check_dimensions(header, expected_sizes))
+    if alpha and has_alpha(header):
+        problems.append((alpha, f"has transparency ({describe(header)})"))
+    if header['interlaced']:
+        problems.append(('warning', "is interlaced"))
+    return problems
+
+def check_dimensions(header, expected_sizes=()):
+    if expected_sizes and not (header['width'] == header['height'] and header['width'] in expected_sizes):
+        expected = ' or '.join(f"{size}x{size}" for size in expected_sizes)
+        return [('error', f"is {header['width']}x{header['height']}, expected {expected}")]
+    if header['width'] != header['height']:
+        return [('error', f"is not square ({header['width']}x{header['height']})")]
+    return []
+
+def check_webp(path, expected_sizes=(), alpha=None):
+    """Return (severity, message) problems for one WebP from its header alone, as check_png does"""
+    try:
+        header = read_webp_header(path)
+    except (OSError, WebPHeaderError) as e:
+        return [('error', str(e))]
+
+    problems = check_dimensions(header, expected_sizes)
+    if alpha and header['alpha']:
+        problems.append((alpha, f"has transparency ({header['width']}x{header['height']} {header['encoding']} WebP)"))
+    return problems
+
+def lint_appiconset(folder):
+    """Check an appiconset's PNGs against the sizes declared in its Contents.json"""
+    problems = []
+    contents_path = os.path.join(folder, 'Contents.json')
+    try:
+        with open(contents_path) as f:
+            images = json.load(f).get('images', [])
+    except (OSError, ValueError) as e:
+        return [('error', contents_path, f"unreadable Contents.json: {e}")]
+
+    referenced = set()
+    for image in images:
+        filename = image.get('filename')
+        slot = f"{image.get('idiom')} {image.get('size')}@{image.get('scale')}"
+        if not filename:
+            problems.append(('warning', contents_path, f"no file assigned to {slot}"))
+            continue
+        referenced.add(filename)
+        path = os.path.join(folder, filename)
+        if not os.path.exists(path):
+            problems.append(('error', path, f"listed in Contents.json for {slot} but missing"))
+            continue
+
+        points = float(image.get('size', '0x0').split('x')[0])
+        scale = int(image.get('scale', '1x').rstrip('x'))
+        expected = round(points * scale)
+        # The App Store marketing icon is rejected if it has any alpha
+        alpha = 'error' if image.get('idiom') == 'ios-marketing' else 'warning'
+        for severity, message in check_png(path, (expected,), alpha):
+            problems.append((severity, path, message))
+
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith('.png') and filename not in referenced:
+            problems.append(('warning', os.path.join(folder, filename), "not referenced by Contents.json"))
+    return problems
+
+def lint_mipmap_dir(folder):
+    """Check launcher icons in a mipmap-<density> folder against the density size"""
+    density = os.path.basename(folder)
+    expected = ANDROID_DENSITY_SIZES.get(density)
+    problems = []
+    resources = {}
+    for filename in sorted(os.listdir(folder)):
+        resource, extension = os.path.splitext(filename)
+        if extension not in MIPMAP_EXTENSIONS:
+            continue
+        path = os.path.join(folder, filename)
+        resources.setdefault(resource, []).append(filename)
+        sizes = ()
+        if expected and resource == ADAPTIVE_FOREGROUND:
+            sizes = (expected, expected * 108 // 48)
+        elif expected and resource in ANDROID_ICON_RESOURCES:
+            sizes = (expected,)
+        check = check_webp if extension == '.webp' else check_png
+        for severity, message in check(path, sizes):
+            problems.append((severity, path, message))
+
+    # aapt2 rejects two files for one resource, e.g. after switching --android-format
+    for resource, filenames in sorted(resources.items()):
+        if len(filenames) > 1:
+            problems.append(('error', os.path.join(folder, filenames[0]),
+                             f"resource '{resource}' has several files: {', '.join(filenames)}"))
+    return problems
+
+def find_icon_dirs(root):
+    """Yield every *.appiconset and mipmap-* folder under root"""
+    for folder, dirs, _ in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        name = os.path.basename(folder)
+        if name.endswith('.appiconset'):
+            yield 'ios', folder
+        elif name.startswith('mipmap-'):
+            yield 'android', folder
+
+def lint_tree(root):
+    """Return (problems, number of PNGs checked) for every icon folder under root"""
+    problems = []
+    checked = 0
+    for kind, folder in find_icon_dirs(root):
+        extensions = ('.png',) if kind == 'ios' else MIPMAP_EXTENSIONS
+        checked += sum(1 for name in os.listdir(folder) if name.endswith(extensions))
+        problems.extend(lint_appiconset(folder) if kind == 'ios' else lint_mipmap_dir(folder))
+    return problems, checked
+
+def main():
+    roots = sys.argv[1:] or [REPO_ROOT / "mobile"]
+    started = time.perf_counter()
+    problems, checked = [], 0
+    for root in roots:
+        root_problems, root_checked = lint_tree(root)
+        problems.extend(root_problems)
+        checked += root_checked
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for severity, path, message in problems:
+        print(f"{'❌' if severity == 'error' else '⚠️'} {os.path.relpath(path)}: {message}")
+    errors = sum(1 for severity, _, _ in problems if severity == 'error')
+    warnings = len(problems) - errors
+    if errors:
+        print(f"❌ {checked} icons checked in {elapsed:.1f} ms: {errors} errors, {warnings} warnings")
+    else:
+        print(f"✅ {checked} icons checked in {elapsed:.1f} ms: no errors, {warnings} warnings")
+    sys.exit(1 if errors else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Named PNG encoding profiles for generated icons
+'dev' favours encode speed, 'release' searches encoder settings for the smallest file
+"""
+
+import io
+import zlib
+
+from PIL import Image
+
+# zlib strategies Pillow accepts as compress_type
+ZLIB_STRATEGIES = [
+    zlib.Z_DEFAULT_STRATEGY,
+    zlib.Z_FILTERED,
+    zlib.Z_HUFFMAN_ONLY,
+    zlib.Z_RLE,
+    zlib.Z_FIXED,
+]
+
+ENCODING_PROFILES = {
+    # Plain save(path, 'PNG'), matching the standalone scripts
+    'default': [{}],
+    # Lowest compression for fast iteration
+    'dev': [{'compress_level': 1}],
+    # Every adaptive-filter/zlib-strategy combination at maximum compression
+    'release': [
+        {'compress_level': 9, 'optimize': optimize, 'compress_type': strategy}
+        for optimize in (False, True)
+        for strategy in ZLIB_STRATEGIES
+    ],
+}
+
+
+def encode_png(image, profile='default'):
+    """Encode an image with the named profile and return the smallest PNG bytes"""
+    candidates = [image]
+    if profile == 'release':
+        palette = lossless_palette(image)
+        if palette is not None:
+            candidates.append(palette)
+
+    best = None
+    for candidate in candidates:
+        for options in ENCODING_PROFILES[profile]:
+            buffer = io.BytesIO()
+            candidate.save(buffer, 'PNG', **options)
+            data = buffer.getvalue()
+            if best is None or len(data) < len(best):
+                best = data
+    return best
+
+
+def lossless_palette(image):
+    """Return an exact palette copy of an opaque RGB image, or None if it has over 256 colors"""
+    if image.mode != 'RGB':
+        return None
+    colors = image.getcolors(256)
+    if colors is None:
+        return None
+
+    # Build the index plane directly: Image.quantize() matches colors through
+    # a reduced-precision cache and can shift near-identical gradient steps
+    lookup = {bytes(color): index for index, (_, color) in enumerate(colors)}
+    rgb = image.tobytes()
+    indices = bytes(lookup[rgb[i:i + 3]] for i in range(0, len(rgb), 3))
+
+    palette = Image.frombytes('P', image.size, indices)
+    palette.putpalette([channel for _, color in colors for channel in color])
+    return palette
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Cached font loading and outlined text masks for branded icons
+Each label is rasterized once as an alpha mask and pasted in the outline and fill colors
+"""
+
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+import asset_trace
+
+BRAND_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+
+@lru_cache(maxsize=32)
+def load_font(path=BRAND_FONT_PATH, size=60):
+    """Return the TrueType font at path, or Pillow's default font if it cannot be loaded"""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+def text_masks(text, font_path=BRAND_FONT_PATH, size=60, stroke=0):
+    """Return (fill mask, outline mask, offset) for text drawn at the origin
+
+    The outline mask is the glyph mask dilated by stroke pixels in every
+    direction (the square the old per-offset draw.text loop covered). offset
+    is where the masks' top-left corner sits relative to the text origin.
+    Masks are cached by (text, font, size, stroke) and shared between callers.
+    """
+    with asset_trace.stage('text', text=text, size=size):
+        return _text_masks(text, font_path, size, stroke)
+
+
+@lru_cache(maxsize=64)
+def _text_masks(text, font_path, size, stroke):
+    font = load_font(font_path, size)
+    left, top, right, bottom = font.getbbox(text)
+    offset = (left - stroke, top - stroke)
+    fill = Image.new('L', (right - left + 2 * stroke, bottom - top + 2 * stroke), 0)
+    ImageDraw.Draw(fill).text((-offset[0], -offset[1]), text, font=font, fill=255)
+    outline = fill.filter(ImageFilter.MaxFilter(2 * stroke + 1)) if stroke else fill
+    return fill, outline, offset
+
+
+def paint_text(image, xy, text, fill, outline=None, font_path=BRAND_FONT_PATH, size=60, stroke=0):
+    """Paste outlined text onto image in place, with its origin at xy"""
+    fill_mask, outline_mask, (dx, dy) = text_masks(text, font_path, size, stroke if outline else 0)
+    position = (xy[0] + dx, xy[1] + dy)
+    if outline:
+        image.paste(outline, position, outline_mask)
+    image.paste(fill, position, fill_mask)
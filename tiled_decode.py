@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Decode very large masters into a reduced working copy within a memory budget
+JPEGs decode at reduced scale; 8-bit PNGs are inflated and reduced one horizontal band at a time
+
+Pillow can only decode a PNG in one piece, so each band is re-wrapped as a
+small PNG of its own: the band's filtered rows, preceded by the already
+unfiltered row above it (stored with filter type 0) so the Up/Average/Paeth
+filters resolve exactly as in the full image.
+"""
+
+import io
+import math
+import struct
+import zlib
+
+from PIL import Image
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bytes per pixel of the decoded band for each 8-bit PNG color type
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# Chunks a band needs besides IHDR and IDAT to decode to the same pixels
+PNG_BAND_CHUNKS = (b'PLTE', b'tRNS', b'gAMA', b'sRGB', b'cHRM')
+
+def png_chunk(chunk_type, data):
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+def read_png_chunks(f):
+    """Yield (type, data) for each chunk; IDAT data is yielded chunk by chunk as it is read"""
+    if f.read(8) != PNG_SIGNATURE:
+        raise ValueError("not a PNG file")
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, chunk_type = struct.unpack('>I4s', header)
+        data = f.read(length)
+        f.seek(4, io.SEEK_CUR)  # CRC
+        yield chunk_type, data
+        if chunk_type == b'IEND':
+            return
+
+def png_ihdr(path):
+    with open(path, 'rb') as f:
+        chunk_type, data = next(read_png_chunks(f))
+    if chunk_type != b'IHDR':
+        raise ValueError("first PNG chunk is not IHDR")
+    return data
+
+def supports_banding(ihdr):
+    """True for PNGs whose raw rows match Pillow's decoded layout (8-bit, not interlaced)"""
+    _, _, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', ihdr)
+    return bit_depth == 8 and color_type in PNG_CHANNELS and not interlace
+
+def iter_png_bands(path, band_rows):
+    """Yield (top row, band image) for a non-interlaced 8-bit PNG, holding one band at a time"""
+    with open(path, 'rb') as f:
+        chunks = read_png_chunks(f)
+        chunk_type, ihdr = next(chunks)
+        if chunk_type != b'IHDR' or not supports_banding(ihdr):
+            raise ValueError("only non-interlaced 8-bit PNGs can be decoded in bands")
+        width, height, _, color_type = struct.unpack('>IIBB', ihdr[:10])
+        row_bytes = 1 + width * PNG_CHANNELS[color_type]
+        band_bytes = band_rows * row_bytes
+
+        extra = b''
+        inflater = zlib.decompressobj()
+        pending = bytearray()
+        # Row "above" the first one: all zeros, exactly as the PNG filters assume
+        previous_row = bytes(row_bytes)
+        top = 0
+
+        def decode_band(raw, rows):
+            nonlocal previous_row
+            png = (PNG_SIGNATURE
+                   + png_chunk(b'IHDR', struct.pack('>II', width, rows + 1) + ihdr[8:])
+                   + extra
+                   + png_chunk(b'IDAT', zlib.compress(previous_row + raw, 0))
+                   + png_chunk(b'IEND', b''))
+            with Image.open(io.BytesIO(png)) as band:
+                band.load()
+                # For 8-bit images Pillow's bytes are the unfiltered PNG row bytes
+                previous_row = b'\x00' + band.crop((0, rows, width, rows + 1)).tobytes()
+                return band.crop((0, 1, width, rows + 1))
+
+        for chunk_type, data in chunks:
+            if chunk_type in PNG_BAND_CHUNKS:
+                extra += png_chunk(chunk_type, data)
+            elif chunk_type == b'IDAT':
+                while data:
+                    # Bound the inflated output so a band never exceeds its share of the budget
+                    pending += inflater.decompress(data, band_bytes)
+                    data = inflater.unconsumed_tail
+                    while len(pending) >= band_bytes and top < height:
+                        rows = min(band_rows, height - top)
+                        yield top, decode_band(bytes(pending[:rows * row_bytes]), rows)
+                        del pending[:rows * row_bytes]
+                        top += rows
+
+        pending += inflater.flush()
+        while top < height:
+            rows = min(band_rows, height - top, len(pending) // row_bytes)
+            if rows <= 0:
+                raise ValueError("PNG image data is truncated")
+            yield top, decode_band(bytes(pending[:rows * row_bytes]), rows)
+            del pending[:rows * row_bytes]
+            top += rows
+
+def reduction_factor(size, working_size, budget):
+    """Smallest reduce() factor leaving the longest edge >= working_size and the copy within budget / 4"""
+    width, height = size
+    factor = max(1, max(width, height) // working_size)
+    while (math.ceil(width / factor) * math.ceil(height / factor) * 4 > budget // 4
+           and factor < max(width, height)):
+        factor += 1
+    return factor
+
+def prepare_band(band, background):
+    """Convert a decoded band to a mode reduce() can average, flattening it if asked"""
+    if band.mode not in ('RGB', 'RGBA', 'L', 'LA') or 'transparency' in band.info:
+        band = band.convert('RGBA')
+    if background is not None and band.mode in ('RGBA', 'LA'):
+        band = band.convert('RGBA')
+        flat = Image.new('RGB', band.size, background)
+        flat.paste(band, (0, 0), band)
+        band = flat
+    return band
+
+def open_reduced(path, working_size, budget, background=None):
+    """Return a copy of the image at path with its longest edge reduced towards working_size
+
+    Decoding stays within roughly budget bytes: JPEGs use draft-mode scaled
+    decoding, 8-bit PNGs are decoded and reduced band by band, and alpha is
+    flattened onto background per band when one is given. Other formats are
+    decoded whole, with a warning.
+    """
+    with Image.open(path) as image:
+        size = image.size
+        banded = image.format == 'PNG' and supports_banding(png_ihdr(path))
+        if not banded:
+            image.draft('RGB', (working_size, working_size))
+            if image.size == size and image.width * image.height * 4 > budget:
+                print(f"⚠️ {image.format} {path} has no reduced-scale decode; decoding it in full")
+            factor = reduction_factor(image.size, working_size, budget)
+            return prepare_band(image, background).reduce(factor)
+
+    factor = reduction_factor(size, working_size, budget)
+    row_bytes = 1 + size[0] * 4
+    # Raw rows, the re-wrapped band, the decoded band and its converted copy
+    # (about 4 band-sized buffers plus Pillow's temporaries) share half the budget
+    band_rows = max(factor, (budget // 2 // (6 * row_bytes)) // factor * factor)
+
+    reduced = None
+    for top, band in iter_png_bands(path, band_rows):
+        band = prepare_band(band, background).reduce(factor)
+        if reduced is None:
+            reduced = Image.new(band.mode, (math.ceil(size[0] / factor), math.ceil(size[1] / factor)))
+        reduced.paste(band, (0, top // factor))
+    return reduced
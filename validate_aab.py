@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Validate Android App Bundle structure without bundletool or a JVM
+Memory-maps the .aab and reads only the central directory and the entries it checks
+"""
+
+from pathlib import Path
+import mmap
+import os
+import re
+import struct
+import sys
+import xml.etree.ElementTree as ElementTree
+import zlib
+
+DEFAULT_AAB_PATH = Path(__file__).resolve().parent / "mobile/ih-academy-android15-compliant.aab"
+
+MIN_TARGET_SDK = 35
+
+END_OF_CENTRAL_DIR = b'PK\x05\x06'
+CENTRAL_DIR_ENTRY = b'PK\x01\x02'
+LOCAL_FILE_HEADER = b'PK\x03\x04'
+
+# Resource directory types aapt2 accepts under <module>/res/
+RESOURCE_TYPES = {
+    'anim', 'animator', 'color', 'drawable', 'font', 'interpolator', 'layout',
+    'menu', 'mipmap', 'navigation', 'raw', 'transition', 'values', 'xml',
+}
+RESOURCE_NAME = re.compile(r'^[a-z0-9_]+(\.[a-z0-9]+)*$')
+
+# Top-level folders that are not feature modules
+NON_MODULE_DIRS = {'BUNDLE-METADATA', 'META-INF'}
+
+# BundleConfig fields and the protobuf wire type bundletool expects for each
+# (1 bundletool, 2 optimizations, 3 compression, 4 master_resources, 5 apex_config,
+#  6 unsigned_embedded_apk_config, 7 asset_modules_config, 8 type, 9 store_archive)
+BUNDLE_CONFIG_WIRE_TYPES = {1: 2, 2: 2, 3: 2, 4: 2, 5: 2, 6: 2, 7: 2, 8: 0, 9: 2}
+
+class BundleFormatError(Exception):
+    """The file is not a readable zip archive"""
+
+def read_central_directory(data):
+    """Return {name: (method, compressed_size, size, local_header_offset)} from the central directory"""
+    # The end record sits in the last 64 KiB + 22 bytes (comment length is a u16)
+    eocd = data.rfind(END_OF_CENTRAL_DIR, max(0, len(data) - 65557))
+    if eocd < 0:
+        raise BundleFormatError("no zip end-of-central-directory record")
+    if eocd + 22 > len(data):
+        raise BundleFormatError(f"truncated end-of-central-directory record at offset {eocd}")
+    count, cd_size, cd_offset = struct.unpack_from('<HII', data, eocd + 10)
+    if cd_offset == 0xFFFFFFFF or count == 0xFFFF:
+        raise BundleFormatError("zip64 bundles are not supported")
+
+    entries = {}
+    position = cd_offset
+    for _ in range(count):
+        if data[position:position + 4] != CENTRAL_DIR_ENTRY or position + 46 > len(data):
+            raise BundleFormatError(f"corrupt central directory at offset {position}")
+        (method, _, _, _, compressed, size, name_len, extra_len,
+         comment_len, _, _, _, offset) = struct.unpack_from('<HHHIIIHHHHHII', data, position + 10)
+        if position + 46 + name_len > len(data):
+            raise BundleFormatError(f"truncated central directory entry at offset {position}")
+        name = bytes(data[position + 46:position + 46 + name_len]).decode('utf-8', 'replace')
+        entries[name] = (method, compressed, size, offset)
+        position += 46 + name_len + extra_len + comment_len
+    return entries
+
+def read_entry(data, entry):
+    """Read and inflate a single entry through its local header"""
+    method, compressed, size, offset = entry
+    if data[offset:offset + 4] != LOCAL_FILE_HEADER or offset + 30 > len(data):
+        raise BundleFormatError(f"corrupt local header at offset {offset}")
+    name_len, extra_len = struct.unpack_from('<HH', data, offset + 26)
+    start = offset + 30 + name_len + extra_len
+    if start + compressed > len(data):
+        raise BundleFormatError(f"truncated entry data at offset {offset}")
+    raw = data[start:start + compressed]
+    if method == 0:
+        return bytes(raw)
+    if method == 8:
+        try:
+            return zlib.decompressobj(-zlib.MAX_WBITS).decompress(raw, size)
+        except zlib.error as e:
+            raise BundleFormatError(f"corrupt deflate data at offset {offset}: {e}")
+    raise BundleFormatError(f"unsupported compression method {method}")
+
+def iter_protobuf(buffer):
+    """Yield (field number, wire type, value) from a protobuf message; raises ValueError if malformed"""
+    position = 0
+
+    def varint():
+        nonlocal position
+        result = shift = 0
+        while True:
+            if position >= len(buffer):
+                raise ValueError("truncated varint")
+            byte = buffer[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    while position < len(buffer):
+        key = varint()
+        field, wire_type = key >> 3, key & 7
+        if field == 0:
+            raise ValueError("field number 0")
+        if wire_type == 0:
+            value = varint()
+        elif wire_type == 1:
+            value, position = buffer[position:position + 8], position + 8
+        elif wire_type == 2:
+            length = varint()
+            value, position = buffer[position:position + length], position + length
+        elif wire_type == 5:
+            value, position = buffer[position:position + 4], position + 4
+        else:
+            raise ValueError(f"unsupported wire type {wire_type}")
+        if position > len(buffer):
+            raise ValueError(f"field {field} runs past the end of the message")
+        yield field, wire_type, value
+
+def check_bundle_config(config):
+    """Return problems bundletool would hit parsing BundleConfig.pb"""
+    try:
+        fields = list(iter_protobuf(config))
+    except ValueError as e:
+        return [f"BundleConfig.pb is not valid protobuf: {e}"]
+
+    problems = []
+    for field, wire_type, value in fields:
+        expected = BUNDLE_CONFIG_WIRE_TYPES.get(field)
+        if expected is not None and wire_type != expected:
+            problems.append(f"BundleConfig.pb field {field} has wire type {wire_type}, expected {expected}")
+        elif expected == 2:
+            try:
+                list(iter_protobuf(value))
+            except ValueError as e:
+                problems.append(f"BundleConfig.pb field {field} holds a malformed message: {e}")
+    return problems
+
+def find_proto_attribute(message, name, depth=0):
+    """Search a proto-format XML tree for an attribute and return its string value"""
+    if depth > 32:
+        return None
+    try:
+        fields = list(iter_protobuf(message))
+    except ValueError:
+        return None
+
+    strings = {field: value for field, wire_type, value in fields if wire_type == 2}
+    # XmlAttribute: 2 = name, 3 = value
+    if strings.get(2) == name.encode() and 3 in strings:
+        return bytes(strings[3]).decode('utf-8', 'replace')
+    for field, wire_type, value in fields:
+        if wire_type == 2 and value:
+            found = find_proto_attribute(value, name, depth + 1)
+            if found is not None:
+                return found
+    return None
+
+def resource_table_files(table):
+    """Return the file paths a resources.pb (aapt2 ResourceTable) declares; raises ValueError if malformed"""
+    # ResourceTable.package = 2 > Package.type = 3 > Type.entry = 3 > Entry.config_value = 6
+    # > ConfigValue.value = 2 > Value.item = 4 > Item.file = 5 > FileReference.path = 1
+    messages = [table]
+    for field in (2, 3, 3, 6, 2, 4, 5):
+        messages = [value for message in messages
+                    for number, wire_type, value in iter_protobuf(message) if number == field and wire_type == 2]
+    return {bytes(value).decode('utf-8', 'replace')
+            for message in messages for number, wire_type, value in iter_protobuf(message)
+            if number == 1 and wire_type == 2}
+
+def manifest_target_sdk(manifest):
+    """Return (targetSdkVersion or None, manifest format) for a text or proto-format manifest"""
+    if manifest.lstrip().startswith(b'<'):
+        match = re.search(rb'android:targetSdkVersion\s*=\s*"(\d+)"', manifest)
+        return (int(match.group(1)) if match else None), 'text'
+    value = find_proto_attribute(manifest, 'targetSdkVersion')
+    return (int(value) if value and value.isdigit() else None), 'proto'
+
+def text_manifest_error(manifest):
+    """Why a plain-text manifest is not well-formed XML, or None"""
+    try:
+        ElementTree.fromstring(bytes(manifest))
+    except ElementTree.ParseError as e:
+        return str(e)
+    return None
+
+def validate_aab(path, min_target_sdk=MIN_TARGET_SDK):
+    """Return a list of (severity, message) problems; severity is 'error' or 'warning'"""
+    try:
+        with open(path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return [('error', "file is empty")]
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError as e:
+        return [('error', f"cannot read bundle: {e.strerror or e}")]
+
+    with data:
+        try:
+            return check_bundle(data, min_target_sdk)
+        except BundleFormatError as e:
+            return [('error', str(e))]
+
+def check_bundle(data, min_target_sdk=MIN_TARGET_SDK):
+    """Check the structure of a mapped bundle"""
+    problems = []
+    entries = read_central_directory(data)
+
+    modules = set()
+    resource_modules = set()
+    for name in entries:
+        if name.endswith('/'):
+            problems.append(('error', f"directory zip entry '{name}' is not allowed"))
+            continue
+        top, _, rest = name.partition('/')
+        if not rest or top in NON_MODULE_DIRS:
+            continue
+        modules.add(top)
+
+        if rest.startswith('res/'):
+            resource_modules.add(top)
+            parts = rest.split('/')
+            folder_type = parts[1].split('-')[0] if len(parts) > 1 else ''
+            if len(parts) != 3 or folder_type not in RESOURCE_TYPES:
+                problems.append(('error', f"invalid resource path '{name}'"))
+            elif not RESOURCE_NAME.match(parts[2]):
+                problems.append(('error', f"invalid resource file name '{name}'"))
+
+    if 'BundleConfig.pb' not in entries:
+        problems.append(('error', "missing required file 'BundleConfig.pb'"))
+    else:
+        for message in check_bundle_config(read_entry(data, entries['BundleConfig.pb'])):
+            problems.append(('error', message))
+
+    if 'base' not in modules:
+        problems.append(('error', "missing required module 'base'"))
+    for module in sorted(modules):
+        if f"{module}/manifest/AndroidManifest.xml" not in entries:
+            problems.append(('error', f"module '{module}' is missing manifest/AndroidManifest.xml"))
+    for module in sorted(resource_modules):
+        table_name = f"{module}/resources.pb"
+        if table_name not in entries:
+            problems.append(('error', f"module '{module}' has res/ entries but no resources.pb"))
+            continue
+        try:
+            declared = resource_table_files(read_entry(data, entries[table_name]))
+        except ValueError as e:
+            problems.append(('error', f"{table_name} is not valid protobuf: {e}"))
+            continue
+        present = {name.partition('/')[2] for name in entries if name.startswith(f"{module}/res/")}
+        for path in sorted(present - declared):
+            problems.append(('error', f"'{module}/{path}' is not declared in {table_name}"))
+        for path in sorted(declared - present):
+            problems.append(('error', f"{table_name} declares '{path}', which is not in the bundle"))
+
+    manifest_name = "base/manifest/AndroidManifest.xml"
+    if manifest_name in entries:
+        manifest = read_entry(data, entries[manifest_name])
+        target_sdk, manifest_format = manifest_target_sdk(manifest)
+        if manifest_format == 'text':
+            problems.append(('warning', "base manifest is plain-text XML, bundletool expects aapt2 proto format"))
+            error = text_manifest_error(manifest)
+            if error:
+                problems.append(('error', f"base manifest is not well-formed XML: {error}"))
+        if target_sdk is None:
+            problems.append(('error', "base manifest does not declare targetSdkVersion"))
+        elif target_sdk < min_target_sdk:
+            problems.append(('error', f"targetSdkVersion {target_sdk} is below the required {min_target_sdk}"))
+
+    return problems
+
+def report(path, problems):
+    """Print the validation result; True if there are no errors"""
+    errors = [message for severity, message in problems if severity == 'error']
+    for severity, message in problems:
+        print(f"{'❌' if severity == 'error' else '⚠️'} {path}: {message}")
+    if not errors:
+        print(f"✅ {path}: bundle structure is valid")
+    return not errors
+
+def main():
+    paths = sys.argv[1:] or [DEFAULT_AAB_PATH]
+    results = [report(path, validate_aab(path)) for path in paths]
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
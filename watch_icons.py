@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Watch the master logo and the icon generator sources and rebuild what they affect
+One long-running interpreter keeps the decoded master, masks and gradients in memory
+
+Files are polled (stdlib only, no inotify dependency). A change to the master
+drops the decoded copy; a change to a generator module reloads it and every
+generator module imported after it. The build manifests then decide which
+outputs are stale, so only the targets that depend on the change re-render.
+"""
+
+import argparse
+import importlib
+import os
+import time
+
+import build_icons
+import icon_assets
+from png_encoding import ENCODING_PROFILES
+
+POLL_INTERVAL = 0.1
+
+def watched_files(logo_path):
+    """Map each watched path to the generator module it defines (None for the master)"""
+    files = {os.path.abspath(logo_path): None}
+    for name in build_icons.GENERATOR_MODULES:
+        files[os.path.abspath(importlib.import_module(name).__file__)] = name
+    return files
+
+def snapshot(paths):
+    """Return {path: (mtime_ns, size)} for the watched paths that currently exist"""
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Editors that save by rename briefly remove the file
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+def reload_generators(names):
+    """Reload the named modules and every generator module imported after them"""
+    order = build_icons.GENERATOR_MODULES
+    first = min(order.index(name) for name in names)
+    for name in order[first:]:
+        importlib.reload(importlib.import_module(name))
+
+def rebuild(ios_style, logo_path, profile, link):
+    """Bring every output up to date in this process, reusing its caches"""
+    started = time.perf_counter()
+    build_icons.build_ios_icons(ios_style, logo_path, profile=profile, link=link)
+    build_icons.build_android_icons(logo_path, profile=profile)
+    print(f"⏱️  Up to date in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+def watch(ios_style='whistle', logo_path=icon_assets.MASTER_LOGO_PATH, profile='default', interval=POLL_INTERVAL,
+          link=False):
+    """Build once, then rebuild on every change until interrupted"""
+    if profile != 'default':
+        print(f"⚠️ Writing '{profile}' profile icons into the tracked icon folders; "
+              "run a default build before committing them")
+    rebuild(ios_style, logo_path, profile, link)
+    files = watched_files(logo_path)
+    built = seen = snapshot(files)
+    failed = set()
+    print(f"👀 Watching {len(files)} files (Ctrl+C to stop)...")
+
+    while True:
+        time.sleep(interval)
+        current = snapshot(files)
+        # Act once a change has settled for one interval, so half-written saves are skipped
+        if current != seen:
+            seen = current
+            continue
+        if current == built:
+            continue
+
+        changed = sorted(path for path in files if current.get(path) != built.get(path))
+        built = current
+        for path in changed:
+            print(f"🔄 Changed: {os.path.relpath(path)}")
+
+        modules = {files[path] for path in changed if files[path]} | failed
+        if os.path.abspath(logo_path) in changed:
+            icon_assets.forget_masters()
+        try:
+            if modules:
+                reload_generators(modules)
+            failed = set()
+            rebuild(ios_style, logo_path, profile, link)
+        except Exception as e:
+            # Keep watching; a failed reload is retried with the next change
+            failed = modules
+            print(f"❌ Rebuild failed: {type(e).__name__}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ios-style', choices=sorted(build_icons.IOS_STYLES), default='whistle',
+                        help="design used for the iOS appiconset (default: whistle)")
+    parser.add_argument('--master', default=icon_assets.MASTER_LOGO_PATH,
+                        help="master logo to derive the icons from")
+    parser.add_argument('--profile', choices=sorted(ENCODING_PROFILES), default='default',
+                        help="PNG encoding profile (default: default, what the committed icons use; "
+                             "dev is fastest but rewrites the tracked icon trees with larger files)")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help=f"seconds between polls (default: {POLL_INTERVAL})")
+    parser.add_argument('--link', action='store_true',
+                        help="hardlink iOS files that share a pixel size instead of copying them")
+    args = parser.parse_args()
+
+    try:
+        watch(args.ios_style, args.master, args.profile, args.interval, args.link)
+    except KeyboardInterrupt:
+        print("\n✅ Stopped watching")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Generate the web client's favicons, apple-touch icon and PWA manifest icons in one pass
+Every size is rendered once; favicon.ico and the optional sprite atlas are assembled from those renders
+
+Outputs go to client/public (Vite's public dir), next to a manifest-icons.json
+snippet to merge into the web app manifest. The atlas packs every size into
+one PNG with a JSON map of sprite rectangles, so a page needs one request.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+
+from PIL import Image
+
+from android_formats import scene_svg
+from atomic_writer import OutputWriter
+from icon_assets import REPO_ROOT
+from png_encoding import ENCODING_PROFILES, encode_png
+from whistle_scene import WHISTLE_SCENE, render_scene_sizes
+
+WEB_ICON_DIR = REPO_ROOT / "client/public"
+
+# Sizes packed into the multi-resolution favicon.ico
+FAVICON_SIZES = (16, 32, 48)
+
+# PNG icons as (filename, size, rel of the <link> tag or None, included in the PWA manifest)
+WEB_ICONS = [
+    ("apple-touch-icon.png", 180, "apple-touch-icon", False),
+    ("icon-192.png", 192, None, True),
+    ("icon-512.png", 512, None, True),
+]
+
+ATLAS_NAME = "icon-atlas"
+MANIFEST_SNIPPET_NAME = "manifest-icons.json"
+
+def web_sizes():
+    """Every distinct pixel size the web set renders"""
+    return sorted(set(FAVICON_SIZES) | {size for _, size, _, _ in WEB_ICONS})
+
+def web_filenames(atlas=False, svg=False):
+    """Names of the files web_files() produces, without rendering anything"""
+    names = ['favicon.ico'] + [filename for filename, _, _, _ in WEB_ICONS]
+    if svg:
+        names.append('favicon.svg')
+    names.append(MANIFEST_SNIPPET_NAME)
+    if atlas:
+        names += [f"{ATLAS_NAME}.png", f"{ATLAS_NAME}.json"]
+    return names
+
+def encode_favicon(images):
+    """Pack the FAVICON_SIZES renders (a {size: image} map) into one .ico, PNG-compressed"""
+    largest = images[max(FAVICON_SIZES)]
+    buffer = io.BytesIO()
+    # Pillow only scales the base image for sizes it is not handed explicitly
+    largest.save(buffer, 'ICO', sizes=[(size, size) for size in FAVICON_SIZES],
+                 append_images=[images[size] for size in FAVICON_SIZES if images[size] is not largest])
+    return buffer.getvalue()
+
+def pack_atlas(images):
+    """Shelf-pack square images, largest first; returns (atlas image, {size: (x, y)})"""
+    sizes = sorted(images, reverse=True)
+    width = max(sizes[0], math.ceil(math.sqrt(sum(size * size for size in sizes))))
+    positions = {}
+    x = y = shelf = 0
+    for size in sizes:
+        if x + size > width:
+            x, y = 0, y + shelf
+            shelf = 0
+        positions[size] = (x, y)
+        x += size
+        shelf = max(shelf, size)
+
+    atlas = Image.new('RGBA', (width, y + shelf), (0, 0, 0, 0))
+    for size, position in positions.items():
+        atlas.paste(images[size], position)
+    return atlas, positions
+
+def atlas_map(positions):
+    """Coordinate map for the atlas, keyed by sprite name"""
+    return {
+        f"icon-{size}": {'x': x, 'y': y, 'width': size, 'height': size}
+        for size, (x, y) in sorted(positions.items())
+    }
+
+def manifest_snippet():
+    """The "icons" member of the web app manifest"""
+    icons = [{'src': f"/{filename}", 'sizes': f"{size}x{size}", 'type': 'image/png'}
+             for filename, size, _, in_manifest in WEB_ICONS if in_manifest]
+    return json.dumps({'icons': icons}, indent=2) + '\n'
+
+def head_links(svg=False):
+    """<link> tags for index.html"""
+    links = ['<link rel="icon" href="/favicon.ico" sizes="any" />']
+    if svg:
+        links.append('<link rel="icon" href="/favicon.svg" type="image/svg+xml" />')
+    links += [f'<link rel="{rel}" href="/{filename}" />' for filename, _, rel, _ in WEB_ICONS if rel]
+    return links
+
+def web_files(images, profile='default', atlas=False, svg=None):
+    """Encode the web icon set from {size: rendered image} as {filename: bytes}
+
+    svg is the SVG text of a vector favicon, or None for raster styles.
+    """
+    files = {'favicon.ico': encode_favicon(images)}
+    for filename, size, _, _ in WEB_ICONS:
+        files[filename] = encode_png(images[size], profile)
+    if svg:
+        files['favicon.svg'] = svg.encode()
+    files[MANIFEST_SNIPPET_NAME] = manifest_snippet().encode()
+    if atlas:
+        sheet, positions = pack_atlas(images)
+        files[f"{ATLAS_NAME}.png"] = encode_png(sheet, profile)
+        coordinates = {'image': f"/{ATLAS_NAME}.png", 'width': sheet.width, 'height': sheet.height,
+                       'sprites': atlas_map(positions)}
+        files[f"{ATLAS_NAME}.json"] = (json.dumps(coordinates, indent=2) + '\n').encode()
+    return files
+
+def generate_web_icons(base_path=WEB_ICON_DIR, profile='default', atlas=False):
+    """Render the whistle once per web size and write the web icon set"""
+    print("🎯 Generating web icons with whistle design...")
+    images = render_scene_sizes(WHISTLE_SCENE, web_sizes())
+    os.makedirs(base_path, exist_ok=True)
+    with OutputWriter() as writer:
+        for filename, data in web_files(images, profile, atlas, scene_svg(WHISTLE_SCENE)).items():
+            writer.write(os.path.join(base_path, filename), data, output=filename)
+            print(f"✅ Generated {filename}: {len(data):,} bytes")
+    print("✅ Add to client/index.html <head>:")
+    for link in head_links(svg=True):
+        print(f"   {link}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', default=WEB_ICON_DIR, help="folder the web icons are written to")
+    parser.add_argument('--profile', choices=sorted(ENCODING_PROFILES), default='default',
+                        help="PNG encoding profile: 'dev' is fastest, 'release' is smallest")
+    parser.add_argument('--atlas', action='store_true',
+                        help=f"also pack every size into {ATLAS_NAME}.png with a JSON coordinate map")
+    args = parser.parse_args()
+
+    generate_web_icons(args.output, args.profile, args.atlas)
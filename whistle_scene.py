@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Declarative whistle icon scene shared by the whistle generators
+Shapes are designed in 1024-unit coordinates and compiled once per size into draw operations
+"""
+
+from functools import lru_cache
+
+from PIL import ImageDraw
+
+import asset_trace
+from icon_assets import PRIMARY_BLUE, SECONDARY_BLUE, vertical_gradient
+from icon_masks import paint_ellipse
+
+# Units the scene geometry is designed in
+SCENE_UNITS = 1024
+
+# Level-of-detail thresholds: smallest icon size a detail is drawn at
+DETAIL_MIN_SIZE = 64    # sound holes
+RING_MIN_SIZE = 40      # chain ring
+ACCENT_MIN_SIZE = 60    # sound lines and circular border
+
+# Each shape is (kind, geometry, color, width, min_size):
+#   rounded_rectangle  geometry (left, top, right, bottom, radius), filled
+#   line               geometry (x0, y0, x1, y1)
+#   ellipse            geometry (left, top, right, bottom), outlined when width > 0
+#   border             geometry (inset,), anti-aliased ring inset from the icon edge
+WHISTLE_SCENE = {
+    'background': (PRIMARY_BLUE, SECONDARY_BLUE),
+    'shapes': (
+        # Whistle body (main tube) and mouthpiece
+        ('rounded_rectangle', (300, 450, 700, 550, 50), 'white', 0, 0),
+        ('rounded_rectangle', (250, 470, 320, 530, 20), 'white', 0, 0),
+        # Sound holes (top)
+        *(('line', (x, 420, x, 440), 'white', 8, DETAIL_MIN_SIZE) for x in range(350, 650, 60)),
+        # Whistle ring/chain attachment
+        ('ellipse', (680, 430, 750, 500), 'white', 12, RING_MIN_SIZE),
+        ('ellipse', (690, 440, 740, 490), 'white', 8, RING_MIN_SIZE),
+        # Sound lines (whistle being blown)
+        *(('line', (320, 465 + i * 15, 320 + length, 465 + i * 15), 'white', 6, ACCENT_MIN_SIZE)
+          for i, length in enumerate([40, 30, 20])),
+        # Subtle circular border
+        ('border', (8,), 'white', 8, ACCENT_MIN_SIZE),
+    ),
+}
+
+
+def compile_scene(scene, size):
+    """Return the scene's draw operations for size as (kind, coordinates, options)"""
+    return _compile_shapes(scene['shapes'], size)
+
+
+@lru_cache(maxsize=None)
+def _compile_shapes(shapes, size):
+    scale = size / SCENE_UNITS
+    ops = []
+    for kind, geometry, color, width, min_size in shapes:
+        if size < min_size:
+            continue
+        stroke = max(1, int(width * scale))
+        if kind == 'rounded_rectangle':
+            *box, radius = geometry
+            ops.append(('rounded_rectangle', [int(v * scale) for v in box],
+                        {'radius': max(1, int(radius * scale)), 'fill': color}))
+        elif kind == 'line':
+            x0, y0, x1, y1 = (int(v * scale) for v in geometry)
+            ops.append(('line', [(x0, y0), (x1, y1)], {'fill': color, 'width': stroke}))
+        elif kind == 'ellipse':
+            box = [int(v * scale) for v in geometry]
+            paint = {'outline': color, 'width': stroke} if width else {'fill': color}
+            ops.append(('ellipse', box, paint))
+        elif kind == 'border':
+            inset = max(1, int(geometry[0] * scale))
+            ops.append(('border', (inset, inset, size - inset, size - inset), {'fill': color, 'width': stroke}))
+        else:
+            raise ValueError(f"Unknown scene shape: {kind}")
+    return tuple(ops)
+
+
+def replay(icon, ops):
+    """Draw compiled operations onto a square RGB image in place"""
+    draw = ImageDraw.Draw(icon)
+    for kind, coordinates, options in ops:
+        if kind == 'border':
+            paint_ellipse(icon, options['fill'], coordinates, options['width'])
+        else:
+            getattr(draw, kind)(coordinates, **options)
+    return icon
+
+
+def render_scene(scene, size):
+    """Render the scene at size on its gradient background"""
+    with asset_trace.stage('scene', size=size):
+        icon = vertical_gradient(*scene['background'], size).copy()
+        return replay(icon, compile_scene(scene, size))
+
+
+def render_scene_sizes(scene, sizes):
+    """Render the scene once per distinct size, returning {size: image}"""
+    return {size: render_scene(scene, size) for size in sorted(set(sizes))}